@@ -1,7 +1,9 @@
 """
 Core application factory and setup.
 """
-from dotenv import load_dotenv
+import asyncio
+import importlib
+
 from quart import Quart
 from quart_cors import cors
 
@@ -17,8 +19,6 @@ def create_app() -> Quart:
     Returns:
         Quart: Configured application instance
     """
-    load_dotenv()
-    
     # Print configuration info
     print(f"🤖 Using Gemini model: {settings.GEMINI_MODEL_NAME}")
     print(f"🎙️ Voice Activity Detection: {'DISABLED' if settings.DISABLE_VAD else 'ENABLED'}")
@@ -31,5 +31,22 @@ def create_app() -> Quart:
     # Register blueprints
     app.register_blueprint(api_bp)
     app.register_blueprint(websocket_bp)
-    
+
+    @app.before_serving
+    async def _warm_gemini_sdk():
+        # The websocket route imports the Gemini SDK lazily; warm that
+        # import off the event loop so the first connection doesn't pay
+        # it, then build the shared client so its connection pool exists
+        # before the first websocket arrives. Warmup failures (e.g. no
+        # API key in a dev shell) fall back to lazy initialization.
+        async def _warm():
+            await asyncio.to_thread(importlib.import_module, "google.genai")
+            from app.services.gemini_client import gemini_manager
+            try:
+                await gemini_manager.initialize_client_async()
+            except Exception as warm_exc:
+                print(f"⚠️ Gemini client warmup skipped: {warm_exc}")
+
+        app.gemini_sdk_warmup = asyncio.ensure_future(_warm())
+
     return app
\ No newline at end of file
@@ -3,15 +3,21 @@ Application configuration management.
 """
 
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 
+@dataclass(frozen=True, slots=True)
 class Settings:
-    """Application settings and configuration."""
-    
+    """Application settings and configuration.
+
+    Frozen with slots so attribute reads are C-slot lookups and the
+    configuration cannot drift after startup.
+    """
+
     # Gemini API Configuration
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
     GEMINI_MODEL_NAME: str = os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash-live-preview")
@@ -25,10 +31,31 @@ class Settings:
     INPUT_SAMPLE_RATE: int = 16000
     OUTPUT_SAMPLE_RATE: int = 24000
     DISABLE_VAD: bool = os.getenv("DISABLE_VAD", "false").lower() == "true"
-    
+    # Automatic VAD tuning: how much audio before detected speech is
+    # kept, and how long a pause ends the turn. 800ms trims ~400ms of
+    # end-of-turn latency versus the previous 1200ms; going much below
+    # ~600ms risks cutting users off mid-sentence, so keep it tunable
+    PREFIX_PADDING_MS: int = int(os.getenv("PREFIX_PADDING_MS", "100"))
+    SILENCE_DURATION_MS: int = int(os.getenv("SILENCE_DURATION_MS", "800"))
+
     # Buffer Configuration
     MAX_BUFFER_SIZE: int = 5000
     BUFFER_TIMEOUT_SECONDS: float = 3.0
+
+    # Tool Execution Configuration
+    MAX_CONCURRENT_TOOLCALLS: int = 8
+    # Simulated latency of the mock background tools; overridable so
+    # perf runs and local testing can drop it to 0
+    TOOL_MOCK_DELAY_SECONDS: float = float(os.getenv("TOOL_MOCK_DELAY_SECONDS", "20"))
+    # Upper bound on a single tool execution; a stalled coroutine or
+    # blocking call is cancelled and reported as an error instead of
+    # holding a concurrency slot forever
+    TOOL_TIMEOUT_SECONDS: float = float(os.getenv("TOOL_TIMEOUT_SECONDS", "30"))
+
+    # Logging Configuration
+    # Cap on captured stdout entries kept in memory; oldest entries are
+    # evicted so a long-running server has a bounded log working set
+    MAX_CAPTURED_LOGS: int = int(os.getenv("MAX_CAPTURED_LOGS", "5000"))
     
     # Voice Configuration
     LANGUAGE_CODE: str = "en-US"
@@ -3,152 +3,241 @@ Handles audio processing and buffering for Gemini responses.
 """
 
 import asyncio
-from typing import Dict, Any
+import time
+import logging
 
 from quart import websocket
 
 from app.core.config import settings
-from app.utils.audio import AudioBuffer, AudioMetadata
+from app.models import SessionState
+from app.utils.audio import (
+    AudioBuffer, AudioMetadata, _OUT_MS_PER_BYTE,
+    pack_audio_frame_batch, pack_audio_frame_records,
+)
+
+logger = logging.getLogger(__name__)
+
+# Caps for the sender task's drain-and-batch: at most this many queued
+# records (or this many payload bytes) are coalesced into one WS frame.
+_SEND_BATCH_MAX_RECORDS = 16
+_SEND_BATCH_MAX_BYTES = 64 * 1024
+
+# Buffer pressure levels that warrant a client warning; hashed lookup
+# instead of rebuilding a list per check.
+_PRESSURE_WARN_LEVELS = frozenset({"medium", "high"})
 
 
 class AudioProcessor:
     """Processes audio responses from Gemini Live API."""
-    
-    def __init__(self, session_state: Dict[str, Any]):
+
+    __slots__ = (
+        "session_state", "_loop", "_buffer_timeout", "_output_sr",
+        "_vad_disabled", "_meta_head", "_meta_tail", "_meta_tail_first",
+        "_corr_counter", "_playback_announced", "_out_q", "_sender_task",
+    )
+
+    def __init__(self, session_state: SessionState):
         self.session_state = session_state
-    
+        # Cache the loop reference; get_event_loop() per chunk is avoidable
+        # overhead on the audio hot path
+        self._loop = asyncio.get_event_loop()
+        # Snapshot immutable settings so hot methods read plain attributes
+        # instead of going through the Settings instance per chunk
+        self._buffer_timeout = settings.BUFFER_TIMEOUT_SECONDS
+        self._output_sr = settings.OUTPUT_SAMPLE_RATE
+        self._vad_disabled = settings.DISABLE_VAD
+        # Pre-serialized constant parts of the per-chunk metadata JSON; only
+        # the variable fields are spliced in per chunk, skipping dict
+        # construction and a full json.dumps traversal on the hot path
+        self._meta_head = b'{"type": "audio_metadata", "sequence": '
+        vad_flag = b'false' if self._vad_disabled else b'true'
+        self._meta_tail_first = (
+            b', "sample_rate": ' + str(self._output_sr).encode()
+            + b', "first_in_run": true, "vad_should_activate": ' + vad_flag + b'}'
+        )
+        self._meta_tail = (
+            b', "sample_rate": ' + str(self._output_sr).encode()
+            + b', "first_in_run": false, "vad_should_activate": ' + vad_flag + b'}'
+        )
+        # Monotonic correlation counter; cheaper than deriving an id from
+        # wall-clock millis and id() per chunk
+        self._corr_counter = 0
+        # Whether the playback-start signal has been sent for the current
+        # run of audio chunks; reset on turn completion or interruption
+        self._playback_announced = False
+        # Outbound queue + sender task: the Gemini receive loop enqueues
+        # ready-to-send records without blocking on client throughput, and
+        # the sender drains whatever has accumulated into one frame
+        self._out_q = asyncio.Queue()
+        self._sender_task = self._loop.create_task(self._sender_loop())
+
     async def process_audio_response(self, audio_data: bytes):
         """Process audio data from Gemini."""
-        # Generate correlation ID for this Gemini response
-        correlation_id = f"gemini_response_{int(asyncio.get_event_loop().time() * 1000)}_{id(audio_data)}"
-        current_time = asyncio.get_event_loop().time()
-        time_since_connection = current_time - self.session_state['connection_start_time']
-        
-        # Process audio data from Gemini
-        
+        state = self.session_state
+        current_time = time.monotonic()
+        # Correlation ID for this Gemini response
+        self._corr_counter += 1
+        correlation_id = self._corr_counter
+        time_since_connection = current_time - state.connection_start_time
+
         try:
             # Auto-flush buffer after timeout if client isn't ready
-            if not self.session_state['client_ready_for_audio'] and time_since_connection > settings.BUFFER_TIMEOUT_SECONDS:
+            if not state.client_ready_for_audio and time_since_connection > self._buffer_timeout:
                 await self._handle_buffer_timeout()
-            
-            if self.session_state['client_ready_for_audio']:
-                await self._send_audio_immediately(audio_data, current_time, correlation_id)
+
+            if state.client_ready_for_audio:
+                self._send_audio_immediately(audio_data, current_time, correlation_id)
             else:
                 await self._buffer_audio(audio_data, current_time, time_since_connection, correlation_id)
-                
+
         except Exception as send_exc:
-            print(f"Backend: Error processing audio data: {send_exc} [ID: {correlation_id}]")
-            self.session_state['active_processing'] = False
+            logger.error("Backend: Error processing audio data: %s [ID: %s]", send_exc, correlation_id)
+            state.active_processing = False
     
+    def reset_playback_run(self):
+        """Mark the current playback run finished (turn complete/interrupt)."""
+        self._playback_announced = False
+
+    def close(self):
+        """Stop the sender task when the connection is going away."""
+        if not self._sender_task.done():
+            self._sender_task.cancel()
+
+    async def _sender_loop(self):
+        """Drain queued audio records and send them in as few frames as possible."""
+        q = self._out_q
+        while True:
+            records = [await q.get()]
+            total = len(records[0][0]) + len(records[0][1])
+            # Coalesce whatever arrived while the previous send was in
+            # flight, up to the batch caps, into a single frame; draining
+            # with get_nowait until QueueEmpty avoids the empty()+get pair
+            # per record
+            while len(records) < _SEND_BATCH_MAX_RECORDS and total < _SEND_BATCH_MAX_BYTES:
+                try:
+                    meta_bytes, audio_data = q.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                records.append((meta_bytes, audio_data))
+                total += len(meta_bytes) + len(audio_data)
+            try:
+                await websocket.send(pack_audio_frame_records(records))
+            except asyncio.CancelledError:
+                raise
+            except Exception as send_exc:
+                logger.error("Backend: Error sending audio batch: %s", send_exc)
+                self.session_state.active_processing = False
+
     async def _handle_buffer_timeout(self):
         """Handle buffer timeout when client isn't ready."""
-        buffer = self.session_state['gemini_audio_buffer']
-        time_since_connection = (
-            asyncio.get_event_loop().time() - self.session_state['connection_start_time']
-        )
-        
-        print(f"⏰ Client readiness timeout - auto-flushing {buffer.size()} buffered chunks")
+        buffer = self.session_state.gemini_audio_buffer
+
+        logger.info("⏰ Client readiness timeout - auto-flushing %d buffered chunks", buffer.size())
         
-        self.session_state['client_ready_for_audio'] = True
+        self.session_state.client_ready_for_audio = True
         
-        # Flush buffered audio
+        # Drain the buffer, then batch all chunks into a few binary frames
+        # instead of two sends per chunk
         buffered_chunks = buffer.flush_all()
         timeout_flushed_count = 0
-        
-        for buffered_chunk in buffered_chunks:
-            try:
-                if isinstance(buffered_chunk, dict) and buffered_chunk.get("type") == "buffered_audio":
-                    # Send metadata first
-                    metadata = buffered_chunk["metadata"]
-                    metadata["flushed_by_timeout"] = True
-                    metadata_msg = {"type": "audio_metadata", **metadata}
-                    
-                    await websocket.send_json(metadata_msg)
-                    await websocket.send(buffered_chunk["audio_data"])
-                    
-                    timeout_flushed_count += 1
-                    chunk_size = metadata["size_bytes"]
-                    duration = metadata["expected_duration_ms"]
-                    # Timeout-flushed chunk sent
-                else:
-                    # Fallback for old format
-                    await websocket.send(buffered_chunk)
-                    timeout_flushed_count += 1
-            except Exception as send_exc:
-                print(f"Error sending timeout-flushed chunk #{timeout_flushed_count}: {send_exc}")
-        
-        print(f"✅ Timeout flushed {timeout_flushed_count} chunks")
+        batch_chunks = []
+
+        for metadata, audio_data in buffered_chunks:
+            metadata["flushed_by_timeout"] = True
+            batch_chunks.append(({"type": "audio_metadata", **metadata}, audio_data))
+            timeout_flushed_count += 1
+
+        try:
+            for frame in pack_audio_frame_batch(batch_chunks):
+                await websocket.send(frame)
+        except Exception as send_exc:
+            logger.error("Error sending timeout-flushed batch: %s", send_exc)
+
+        logger.info("✅ Timeout flushed %d chunks", timeout_flushed_count)
     
-    async def _send_audio_immediately(self, audio_data: bytes, current_time: float, correlation_id: str = None):
-        """Send audio immediately to ready client."""
+    def _send_audio_immediately(self, audio_data: bytes, current_time: float, correlation_id: str = None):
+        """Hand audio to the sender task for a ready client."""
         chunk_size = len(audio_data)
-        
+        state = self.session_state
+
         # Generate sequence number
-        self.session_state['audio_sequence_counter'] += 1
-        sequence_num = self.session_state['audio_sequence_counter']
-        
-        # Create metadata
-        audio_metadata = AudioMetadata.create_metadata(
-            sequence=sequence_num,
-            chunk_size=chunk_size,
-            sample_rate=settings.OUTPUT_SAMPLE_RATE,
-            timestamp=current_time
-        )
-        
-        # Log when Gemini starts transmitting responses (playback state detection)
-        print(f"🔊 GEMINI PLAYBACK START: "
-              f"id={correlation_id}, "
-              f"seq={sequence_num}, "
-              f"size={chunk_size}bytes, "
-              f"should_activate_frontend_vad={not settings.DISABLE_VAD}")
-        
-        # Send playback start signal to frontend for VAD correlation
-        await websocket.send_json({
-            "type": "gemini_playback_state", 
-            "playing": True,
-            "sequence": sequence_num,
-            "correlation_id": correlation_id,
-            "vad_should_activate": not settings.DISABLE_VAD
-        })
-        
-        # Send metadata first, then audio
-        await websocket.send_json(audio_metadata)
-        await websocket.send(audio_data)
-        
-        expected_duration = audio_metadata["expected_duration_ms"]
-        print(f"🔊 UNIFIED Backend: Sent audio seq={sequence_num} ({chunk_size} bytes, {expected_duration:.1f}ms) [ID: {correlation_id}]")
+        state.audio_sequence_counter += 1
+        sequence_num = state.audio_sequence_counter
+
+        expected_duration_ms = chunk_size * _OUT_MS_PER_BYTE
+
+        # Announce playback start only on the first chunk of a run; the
+        # signal is monotonic within a turn so repeating it per chunk cost
+        # an extra flag for the client to ignore on every frame
+        first_in_run = not self._playback_announced
+
+        # Splice the variable fields into the pre-serialized metadata JSON;
+        # the playback-start signal rides along as first_in_run so the chunk
+        # goes out as one binary frame instead of three messages
+        meta_bytes = b"".join((
+            self._meta_head, str(sequence_num).encode(),
+            b', "size_bytes": ', str(chunk_size).encode(),
+            b', "expected_duration_ms": ', b"%.2f" % expected_duration_ms,
+            b', "timestamp": ', b"%.6f" % current_time,
+            b', "correlation_id": ', str(correlation_id).encode(),
+            self._meta_tail_first if first_in_run else self._meta_tail,
+        ))
+
+        if first_in_run:
+            self._playback_announced = True
+            # Log when Gemini starts transmitting responses (playback state
+            # detection); guarded so the hot path skips string formatting
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "🔊 GEMINI PLAYBACK START: id=%s, seq=%d, size=%dbytes, "
+                    "should_activate_frontend_vad=%s",
+                    correlation_id, sequence_num, chunk_size, not self._vad_disabled
+                )
+
+        # Enqueue for the sender task; the receive loop never waits on the
+        # client socket
+        self._out_q.put_nowait((meta_bytes, audio_data))
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🔊 UNIFIED Backend: Queued audio seq=%d (%d bytes, %.1fms) [ID: %s]",
+                sequence_num, chunk_size, expected_duration_ms, correlation_id
+            )
     
     async def _buffer_audio(self, audio_data: bytes, current_time: float, time_since_connection: float, correlation_id: str = None):
         """Buffer audio when client is not ready."""
-        buffer = self.session_state['gemini_audio_buffer']
-        
+        state = self.session_state
+        buffer = state.gemini_audio_buffer
+
         # Generate sequence number
-        self.session_state['audio_sequence_counter'] += 1
-        sequence_num = self.session_state['audio_sequence_counter']
+        state.audio_sequence_counter += 1
+        sequence_num = state.audio_sequence_counter
         
         # Add to buffer
-        audio_chunk_data, removed_chunks = buffer.add_audio_chunk(
+        chunk_meta, removed_count = buffer.add_audio_chunk(
             audio_data,
             {"sequence": sequence_num, "timestamp": current_time}
         )
-        
-        chunk_size = len(audio_data)
-        expected_duration = audio_chunk_data["metadata"]["expected_duration_ms"]
-        
-        print(f"📦 GEMINI BUFFERING: id={correlation_id}, seq={sequence_num} ({chunk_size} bytes, {expected_duration:.1f}ms) - client not ready (t+{time_since_connection:.1f}s)")
-        
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "📦 GEMINI BUFFERING: id=%s, seq=%d (%d bytes, %.1fms) - client not ready (t+%.1fs)",
+                correlation_id, sequence_num, len(audio_data),
+                chunk_meta["expected_duration_ms"], time_since_connection
+            )
+
         # Handle buffer pressure
         await self._handle_buffer_pressure(buffer)
-        
+
         # Handle overflow
-        if removed_chunks:
-            await self._handle_buffer_overflow(removed_chunks, buffer)
+        if removed_count:
+            await self._handle_buffer_overflow(removed_count, buffer)
     
     async def _handle_buffer_pressure(self, buffer: AudioBuffer):
         """Handle buffer pressure warnings."""
         pressure_level = buffer.get_pressure_level()
         
-        if pressure_level in ["medium", "high"]:
+        if pressure_level in _PRESSURE_WARN_LEVELS:
             pressure_warning = AudioMetadata.create_buffer_pressure_warning(
                 buffer_size=buffer.size(),
                 max_size=buffer.max_size,
@@ -157,19 +246,19 @@ class AudioProcessor:
             
             try:
                 await websocket.send_json(pressure_warning)
-                print(f"⚠️ Buffer pressure warning sent: {pressure_level} ({buffer.size()}/{buffer.max_size})")
+                logger.warning("⚠️ Buffer pressure warning sent: %s (%d/%d)", pressure_level, buffer.size(), buffer.max_size)
             except Exception as e:
-                print(f"Failed to send buffer pressure warning: {e}")
+                logger.error("Failed to send buffer pressure warning: %s", e)
     
-    async def _handle_buffer_overflow(self, removed_chunks, buffer: AudioBuffer):
+    async def _handle_buffer_overflow(self, removed_count: int, buffer: AudioBuffer):
         """Handle buffer overflow and send truncation warning."""
         truncation_warning = AudioMetadata.create_truncation_warning(
-            chunks_removed=len(removed_chunks),
+            chunks_removed=removed_count,
             buffer_size=buffer.size()
         )
-        
+
         try:
             await websocket.send_json(truncation_warning)
-            print(f"🗑️ Buffer overflow: removed {len(removed_chunks)} chunks, sent truncation warning")
+            logger.warning("🗑️ Buffer overflow: removed %d chunks, sent truncation warning", removed_count)
         except Exception as e:
-            print(f"Failed to send truncation warning: {e}")
\ No newline at end of file
+            logger.error("Failed to send truncation warning: %s", e)
\ No newline at end of file
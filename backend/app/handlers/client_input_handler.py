@@ -4,66 +4,130 @@ Handles client input and forwards to Gemini Live API.
 
 import asyncio
 import time
-from typing import Dict, Any
+import logging
 from websockets.exceptions import ConnectionClosedOK
 
 from quart import websocket
 from google.genai import types
 
 from app.core.config import settings
-from app.utils.audio import AudioMetadata
+from app.models import SessionState
+from app.utils.audio import AudioMetadata, pack_audio_frame_batch
+
+logger = logging.getLogger(__name__)
+
+# Inbound mic coalescing: sub-frame packets are accumulated until 20 ms
+# of PCM16 @ 16 kHz is ready (or the flush timer fires) so each call into
+# the Gemini realtime API carries a full frame.
+_IN_COALESCE_TARGET_BYTES = 640
+_IN_COALESCE_MAX_DELAY = 0.02
 
 
 class ClientInputHandler:
     """Handles client WebSocket input and forwards to Gemini."""
-    
-    def __init__(self, session, session_state: Dict[str, Any]):
+
+    __slots__ = (
+        "session", "session_state", "_loop", "_audio_log_counter",
+        "_last_logged_count", "_stats_log_handle", "_dispatch",
+        "_in_buf", "_in_flush_handle", "_flush_tasks",
+        "_pcm_mime_type", "_use_vertexai", "_stop_event",
+    )
+
+    def __init__(self, session, session_state: SessionState):
         self.session = session
         self.session_state = session_state
-    
+        self._loop = asyncio.get_event_loop()
+        self._audio_log_counter = 0
+        self._last_logged_count = 0
+        self._stats_log_handle = None
+        self._in_buf = bytearray()
+        self._in_flush_handle = None
+        # Flush tasks started from the coalescing timer; pinned here
+        # because the loop keeps only weak task references
+        self._flush_tasks = set()
+        # Constant per process; built once instead of per audio chunk
+        self._pcm_mime_type = f"audio/pcm;rate={settings.INPUT_SAMPLE_RATE}"
+        self._use_vertexai = settings.GOOGLE_GENAI_USE_VERTEXAI
+        # Cooperative shutdown signal so the receive loop doesn't need a
+        # per-packet wait_for timeout (each one allocates and cancels a
+        # timer plus a TimeoutError). Shared via SessionState so the
+        # response handler can wake this loop when it stops processing
+        self._stop_event = session_state.stop_event
+        # Jump table keyed on the concrete type; one dict get replaces the
+        # per-packet isinstance chain (the WS transport only ever hands us
+        # exact str or bytes)
+        self._dispatch = {
+            str: self._handle_text_message,
+            bytes: self._handle_audio_data,
+        }
+
+    def signal_stop(self):
+        """Wake the input loop so it can observe a shutdown request."""
+        self._stop_event.set()
+
+    def _log_audio_stats(self):
+        """Log the running audio packet count once per second off the hot path."""
+        count = self._audio_log_counter
+        if count != self._last_logged_count:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "🎤 CLIENT_AUDIO: %d audio packets received (+%d in the last second)",
+                    count, count - self._last_logged_count
+                )
+            self._last_logged_count = count
+        self._stats_log_handle = self._loop.call_later(1.0, self._log_audio_stats)
+
     async def handle_client_input(self):
         """Main client input handling loop."""
+        stop_wait = asyncio.ensure_future(self._stop_event.wait())
+        self._stats_log_handle = self._loop.call_later(1.0, self._log_audio_stats)
         try:
-            while self.session_state['active_processing']:
+            while self.session_state.active_processing:
                 try:
-                    client_data = await asyncio.wait_for(websocket.receive(), timeout=0.2)
-                    
-                    receive_timestamp = time.strftime("%H:%M:%S.%f")[:-3]
-                    
-                    if isinstance(client_data, str):
-                        print(f"\\033[94m[{receive_timestamp}] 📝 CLIENT_TEXT: Received text message from client\\033[0m")
-                        await self._handle_text_message(client_data)
-                    elif isinstance(client_data, bytes):
-                        # Only log audio occasionally to avoid spam
-                        if hasattr(self, '_audio_log_counter'):
-                            self._audio_log_counter += 1
-                        else:
-                            self._audio_log_counter = 1
-                            
-                        if self._audio_log_counter % 100 == 1:  # Log every 100th audio packet
-                            print(f"\\033[94m[{receive_timestamp}] 🎤 CLIENT_AUDIO: Received audio data from client (packet #{self._audio_log_counter})\\033[0m")
-                        
-                        await self._handle_audio_data(client_data)
+                    receive_future = asyncio.ensure_future(websocket.receive())
+                    await asyncio.wait(
+                        {receive_future, stop_wait},
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not receive_future.done():
+                        # Shutdown was signalled while waiting for input
+                        receive_future.cancel()
+                        break
+                    client_data = receive_future.result()
+
+                    handler = self._dispatch.get(type(client_data))
+                    if handler is not None:
+                        await handler(client_data)
                     else:
-                        print(f"\\033[94m[{receive_timestamp}] ❓ CLIENT_UNKNOWN: Unexpected data type: {type(client_data)}\\033[0m")
+                        logger.warning("❓ CLIENT_UNKNOWN: Unexpected data type: %s", type(client_data))
                         
-                except asyncio.TimeoutError:
-                    if not self.session_state['active_processing']:
-                        break
-                    continue
                 except ConnectionClosedOK:
-                    print("INFO: Client closed the connection.")
-                    self.session_state['active_processing'] = False
+                    logger.info("Client closed the connection.")
+                    self.session_state.active_processing = False
                     break
                 except Exception as e_fwd_outer:
-                    print(f"Backend: Error in handle_client_input: {type(e_fwd_outer).__name__}: {e_fwd_outer}")
-                    self.session_state['active_processing'] = False
+                    logger.error("Backend: Error in handle_client_input: %s: %s", type(e_fwd_outer).__name__, e_fwd_outer)
+                    self.session_state.active_processing = False
                     break
         finally:
-            self.session_state['active_processing'] = False
+            self.session_state.active_processing = False
+            self._stop_event.set()
+            if self._stats_log_handle is not None:
+                self._stats_log_handle.cancel()
+            if self._in_flush_handle is not None:
+                self._in_flush_handle.cancel()
+                self._in_flush_handle = None
+            try:
+                await self._flush_mic_audio()
+            except Exception:
+                pass  # Session may already be gone on shutdown
+            if not stop_wait.done():
+                stop_wait.cancel()
     
     async def _handle_text_message(self, message_text: str):
         """Handle text message from client."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📝 CLIENT_TEXT: Received text message from client")
         if message_text == "CLIENT_AUDIO_READY":
             await self._handle_client_ready_signal()
         else:
@@ -71,39 +135,29 @@ class ClientInputHandler:
     
     async def _handle_client_ready_signal(self):
         """Handle client audio ready signal and flush buffered audio."""
-        self.session_state['client_ready_for_audio'] = True
-        mic_buffer = self.session_state['mic_audio_buffer']
+        self.session_state.client_ready_for_audio = True
+        mic_buffer = self.session_state.mic_audio_buffer
         
-        print(f"🔊 Client audio ready! Flushing {mic_buffer.size()} buffered chunks")
+        logger.info("🔊 Client audio ready! Flushing %d buffered chunks", mic_buffer.size())
         
-        # Flush buffered audio chunks
+        # Drain the buffer, then batch all chunks into a few binary frames
+        # instead of two sends per chunk
         buffered_chunks = mic_buffer.flush_all()
         flushed_count = 0
-        
-        for buffered_chunk in buffered_chunks:
-            try:
-                if isinstance(buffered_chunk, dict) and buffered_chunk.get("type") == "buffered_audio":
-                    # Send metadata first
-                    metadata_msg = {
-                        "type": "audio_metadata",
-                        **buffered_chunk["metadata"],
-                        "flushed_by_timeout": True
-                    }
-                    await websocket.send_json(metadata_msg)
-                    await websocket.send(buffered_chunk["audio_data"])
-                    
-                    flushed_count += 1
-                    chunk_size = buffered_chunk["metadata"]["size_bytes"]
-                    sequence = buffered_chunk["metadata"]["sequence"]
-                    # Chunk flushed successfully
-                else:
-                    # Fallback for old format
-                    await websocket.send(buffered_chunk)
-                    flushed_count += 1
-            except Exception as send_exc:
-                print(f"Error sending buffered audio chunk #{flushed_count}: {send_exc}")
-        
-        print(f"✅ Flushed {flushed_count} buffered audio chunks")
+        batch_chunks = []
+
+        for metadata, audio_data in buffered_chunks:
+            metadata["flushed_by_timeout"] = True
+            batch_chunks.append(({"type": "audio_metadata", **metadata}, audio_data))
+            flushed_count += 1
+
+        try:
+            for frame in pack_audio_frame_batch(batch_chunks):
+                await websocket.send(frame)
+        except Exception as send_exc:
+            logger.error("Error sending buffered audio batch: %s", send_exc)
+
+        logger.info("✅ Flushed %d buffered audio chunks", flushed_count)
     
     async def _handle_text_prompt(self, message_text: str):
         """Handle text prompt from client."""
@@ -119,27 +173,57 @@ class ClientInputHandler:
     
     async def _handle_audio_data(self, audio_chunk: bytes):
         """Handle audio data from client."""
+        # Counting only; the periodic stats timer does the logging so the
+        # hot path has no sampling branch
+        self._audio_log_counter += 1
         if not audio_chunk:
-            print("⚠️ AUDIO WARNING: Received empty audio chunk")
+            logger.warning("⚠️ AUDIO WARNING: Received empty audio chunk")
             return
-        
+
+        # Coalesce sub-frame packets so upstream sees full 20 ms frames
+        self._in_buf += audio_chunk
+        if len(self._in_buf) >= _IN_COALESCE_TARGET_BYTES:
+            if self._in_flush_handle is not None:
+                self._in_flush_handle.cancel()
+                self._in_flush_handle = None
+            await self._flush_mic_audio()
+        elif self._in_flush_handle is None:
+            # Tiny packet: give the next ones a chance to arrive, but never
+            # hold audio back longer than one frame interval
+            self._in_flush_handle = self._loop.call_later(
+                _IN_COALESCE_MAX_DELAY, self._flush_mic_audio_soon
+            )
+
+    def _flush_mic_audio_soon(self):
+        """Timer callback: flush whatever mic audio has accumulated."""
+        self._in_flush_handle = None
+        task = asyncio.ensure_future(self._flush_mic_audio())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush_mic_audio(self):
+        """Forward the coalesced mic audio to Gemini."""
+        if not self._in_buf:
+            return
+        audio_chunk = bytes(self._in_buf)
+        self._in_buf.clear()
+
         # Send audio to Gemini with the correct parameter based on the configuration
-        if settings.GOOGLE_GENAI_USE_VERTEXAI:
+        if self._use_vertexai:
             await self.session.send_realtime_input(
                 media=types.Blob(
-                    mime_type=f"audio/pcm;rate={settings.INPUT_SAMPLE_RATE}",
+                    mime_type=self._pcm_mime_type,
                     data=audio_chunk
                 )
             )
         else:
             await self.session.send_realtime_input(
                 audio=types.Blob(
-                    mime_type=f"audio/pcm;rate={settings.INPUT_SAMPLE_RATE}",
+                    mime_type=self._pcm_mime_type,
                     data=audio_chunk
                 )
             )
     
     def _get_connection_time(self) -> float:
         """Get time since connection started."""
-        current_time = asyncio.get_event_loop().time()
-        return current_time - self.session_state['connection_start_time']
\ No newline at end of file
+        return time.monotonic() - self.session_state.connection_start_time
\ No newline at end of file
@@ -3,148 +3,173 @@ Handles transcription processing for user input and model output.
 """
 
 import uuid
-from typing import Dict, Any
 
 from quart import websocket
 
+from app.models import SessionState
+from app.utils.serialization import send_json_fast
+
 
 class TranscriptionProcessor:
-    """Processes transcription data from Gemini Live API."""
-    
-    def __init__(self, session_state: Dict[str, Any]):
+    """Processes transcription data from Gemini Live API.
+
+    Streaming updates are sent as incremental deltas: each chunk goes out
+    once, and the client concatenates deltas by utterance id. The full
+    text is only assembled and sent on finalization, so an N-chunk
+    utterance costs O(N) bytes on the wire instead of the O(N^2) of
+    resending the accumulated text every chunk. Server-side accumulation
+    uses a parts list joined at finalization for the same reason.
+    """
+
+    def __init__(self, session_state: SessionState):
         self.session_state = session_state
-    
+
     async def process_transcriptions(self, server_content):
         """Process input and output transcriptions."""
+        # Collect every update produced by this server_content event and
+        # emit them in a single websocket send: one JSON encode and one
+        # frame instead of one per side per chunk.
+        pending = []
+
         # Process user input transcription
-        await self._process_user_transcription(server_content)
-        
+        payload = self._process_user_transcription(server_content)
+        if payload is not None:
+            pending.append(payload)
+
         # Process model output transcription
-        await self._process_model_transcription(server_content)
-        
+        payload = self._process_model_transcription(server_content)
+        if payload is not None:
+            pending.append(payload)
+
         # Handle completion events
-        await self._handle_completion_events(server_content)
-    
-    async def _process_user_transcription(self, server_content):
-        """Process user input transcription."""
-        if not (hasattr(server_content, 'input_transcription') and 
-                server_content.input_transcription and
-                hasattr(server_content.input_transcription, 'text') and
-                server_content.input_transcription.text):
-            return
-        
-        user_speech_chunk = server_content.input_transcription.text
-        
+        self._collect_completion_events(server_content, pending)
+
+        if pending:
+            await self._send_updates(pending)
+
+    async def _send_updates(self, pending):
+        """Send the accumulated updates in one websocket frame."""
+        try:
+            if len(pending) == 1:
+                await send_json_fast(websocket, pending[0])
+            else:
+                await send_json_fast(websocket, {
+                    'type': 'transcription_batch',
+                    'updates': pending
+                })
+        except Exception as send_exc:
+            print(f"Backend: Error sending transcription updates: {send_exc}")
+            self.session_state.active_processing = False
+
+    def _process_user_transcription(self, server_content):
+        """Build the user input transcription delta, if any."""
+        # One getattr probe instead of the hasattr-and-attribute chain;
+        # this guard runs for every streamed chunk
+        transcription = getattr(server_content, 'input_transcription', None)
+        user_speech_chunk = transcription.text if transcription is not None else None
+        if not user_speech_chunk:
+            return None
+
+        ss = self.session_state
+
         # Initialize utterance if needed
-        if self.session_state['current_user_utterance_id'] is None:
-            self.session_state['current_user_utterance_id'] = str(uuid.uuid4())
-            self.session_state['accumulated_user_speech_text'] = ""
-        
-        # Accumulate text
-        self.session_state['accumulated_user_speech_text'] += user_speech_chunk
-        
-        if self.session_state['accumulated_user_speech_text']:
-            payload = {
-                'id': self.session_state['current_user_utterance_id'],
-                'text': self.session_state['accumulated_user_speech_text'],
-                'sender': 'user',
-                'type': 'user_transcription_update',
-                'is_final': False
-            }
-            
-            try:
-                await websocket.send_json(payload)
-            except Exception as send_exc:
-                print(f"Backend: Error sending user transcription: {send_exc}")
-                self.session_state['active_processing'] = False
-    
-    async def _process_model_transcription(self, server_content):
-        """Process model output transcription."""
-        if not (hasattr(server_content, 'output_transcription') and 
-                server_content.output_transcription and
-                hasattr(server_content.output_transcription, 'text') and
-                server_content.output_transcription.text):
-            return
-        
+        if ss.current_user_utterance_id is None:
+            ss.current_user_utterance_id = str(uuid.uuid4())
+            ss.user_speech_parts.clear()
+            ss.user_transcript_seq = 0
+
+        # Accumulate the chunk; the full string is only built on final
+        ss.user_speech_parts.append(user_speech_chunk)
+        ss.user_transcript_seq += 1
+
+        return {
+            'id': ss.current_user_utterance_id,
+            'delta': user_speech_chunk,
+            'seq': ss.user_transcript_seq,
+            'sender': 'user',
+            'type': 'user_transcription_delta',
+            'is_final': False
+        }
+
+    def _process_model_transcription(self, server_content):
+        """Build the model output transcription delta, if any."""
+        transcription = getattr(server_content, 'output_transcription', None)
+        chunk = transcription.text if transcription is not None else None
+        if not chunk:
+            return None
+        ss = self.session_state
+
         # Initialize utterance if needed
-        if self.session_state['current_model_utterance_id'] is None:
-            self.session_state['current_model_utterance_id'] = str(uuid.uuid4())
-            self.session_state['accumulated_model_speech_text'] = ""
-        
-        chunk = server_content.output_transcription.text
-        if chunk:
-            self.session_state['accumulated_model_speech_text'] += chunk
-            payload = {
-                'id': self.session_state['current_model_utterance_id'],
-                'text': self.session_state['accumulated_model_speech_text'],
-                'sender': 'model',
-                'type': 'model_response_update',
-                'is_final': False
-            }
-            
-            try:
-                await websocket.send_json(payload)
-            except Exception as send_exc:
-                print(f"Backend: Error sending model response: {send_exc}")
-                self.session_state['active_processing'] = False
-    
-    async def _handle_completion_events(self, server_content):
-        """Handle generation and turn completion events."""
+        if ss.current_model_utterance_id is None:
+            ss.current_model_utterance_id = str(uuid.uuid4())
+            ss.model_speech_parts.clear()
+            ss.model_transcript_seq = 0
+
+        ss.model_speech_parts.append(chunk)
+        ss.model_transcript_seq += 1
+
+        return {
+            'id': ss.current_model_utterance_id,
+            'delta': chunk,
+            'seq': ss.model_transcript_seq,
+            'sender': 'model',
+            'type': 'model_response_delta',
+            'is_final': False
+        }
+
+    def _collect_completion_events(self, server_content, pending):
+        """Append generation and turn completion updates to the batch."""
         # Handle model generation completion
-        if (hasattr(server_content, 'generation_complete') and 
-            server_content.generation_complete):
-            await self._handle_model_generation_complete()
-        
+        if getattr(server_content, 'generation_complete', None):
+            payload = self._handle_model_generation_complete()
+            if payload is not None:
+                pending.append(payload)
+
         # Handle turn completion (user speech finalization)
-        if (hasattr(server_content, 'turn_complete') and 
-            server_content.turn_complete):
-            await self._handle_turn_complete()
-    
-    async def _handle_model_generation_complete(self):
-        """Handle model generation completion."""
-        if (self.session_state['current_model_utterance_id'] and 
-            self.session_state['accumulated_model_speech_text']):
-            
+        if getattr(server_content, 'turn_complete', None):
+            payload = self._handle_turn_complete()
+            if payload is not None:
+                pending.append(payload)
+
+    def _handle_model_generation_complete(self):
+        """Finalize the model utterance and build its final update."""
+        ss = self.session_state
+        payload = None
+        if ss.current_model_utterance_id and ss.model_speech_parts:
             payload = {
-                'id': self.session_state['current_model_utterance_id'],
-                'text': self.session_state['accumulated_model_speech_text'],
+                'id': ss.current_model_utterance_id,
+                'text': "".join(ss.model_speech_parts),
                 'sender': 'model',
                 'type': 'model_response_update',
                 'is_final': True
             }
-            
-            try:
-                await websocket.send_json(payload)
-            except Exception as send_exc:
-                print(f"Backend: Error sending final model response: {send_exc}")
-                self.session_state['active_processing'] = False
-        
+
         # Reset model utterance state
-        self.session_state['current_model_utterance_id'] = None
-        self.session_state['accumulated_model_speech_text'] = ""
-    
-    async def _handle_turn_complete(self):
-        """Handle turn completion (finalize user speech)."""
-        if (self.session_state['current_user_utterance_id'] and 
-            self.session_state['accumulated_user_speech_text']):
-            
+        ss.current_model_utterance_id = None
+        ss.model_speech_parts.clear()
+        ss.model_transcript_seq = 0
+        return payload
+
+    def _handle_turn_complete(self):
+        """Finalize the user utterance and build its final update."""
+        ss = self.session_state
+        payload = None
+        if ss.current_user_utterance_id and ss.user_speech_parts:
+            user_text = "".join(ss.user_speech_parts)
             payload = {
-                'id': self.session_state['current_user_utterance_id'],
-                'text': self.session_state['accumulated_user_speech_text'],
+                'id': ss.current_user_utterance_id,
+                'text': user_text,
                 'sender': 'user',
                 'type': 'user_transcription_update',
                 'is_final': True
             }
-            
-            try:
-                await websocket.send_json(payload)
-                print(f"🎤 User said: {self.session_state['accumulated_user_speech_text']}")
-            except Exception as send_exc:
-                print(f"Backend: Error sending final user transcription: {send_exc}")
-                self.session_state['active_processing'] = False
-        
+            print(f"🎤 User said: {user_text}")
+
         # Reset all utterance states
-        self.session_state['current_user_utterance_id'] = None
-        self.session_state['accumulated_user_speech_text'] = ""
-        self.session_state['current_model_utterance_id'] = None
-        self.session_state['accumulated_model_speech_text'] = ""
\ No newline at end of file
+        ss.current_user_utterance_id = None
+        ss.user_speech_parts.clear()
+        ss.user_transcript_seq = 0
+        ss.current_model_utterance_id = None
+        ss.model_speech_parts.clear()
+        ss.model_transcript_seq = 0
+        return payload
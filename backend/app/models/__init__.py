@@ -0,0 +1,7 @@
+"""
+Data models for the application.
+"""
+
+from .session import SessionState, SpeechState
+
+__all__ = ["SessionState", "SpeechState"]
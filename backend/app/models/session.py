@@ -0,0 +1,53 @@
+"""
+Per-connection session state.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from app.utils.audio import AudioBuffer
+
+
+@dataclass(slots=True)
+class SessionState:
+    """
+    Mutable state shared by the handlers of one WebSocket connection.
+
+    Slotted so the per-chunk reads and writes in the audio hot path are
+    attribute slot accesses instead of dict string hashing.
+    """
+
+    connection_start_time: float
+    current_session_handle: Optional[str] = None
+    client_ready_for_audio: bool = False
+    mic_audio_buffer: AudioBuffer = field(default_factory=AudioBuffer)
+    gemini_audio_buffer: AudioBuffer = field(default_factory=AudioBuffer)
+    audio_sequence_counter: int = 0
+    active_processing: bool = True
+    # Set by whichever handler flips active_processing off, so the
+    # input loop parked in websocket.receive() wakes immediately
+    # instead of waiting for the next client packet
+    stop_event: asyncio.Event = field(default_factory=asyncio.Event)
+    current_user_utterance_id: Optional[str] = None
+    user_speech_parts: List[str] = field(default_factory=list)
+    user_transcript_seq: int = 0
+    current_model_utterance_id: Optional[str] = None
+    model_speech_parts: List[str] = field(default_factory=list)
+    model_transcript_seq: int = 0
+
+
+@dataclass(slots=True)
+class SpeechState:
+    """
+    Speech-activity tracking for coordinated tool response delivery.
+
+    Read and written per streamed audio frame, so the same slotted
+    layout as SessionState applies.
+    """
+
+    is_gemini_speaking: bool = False
+    current_turn_id: Optional[str] = None
+    last_audio_timestamp: Optional[float] = None
+    speech_start_time: Optional[float] = None
+    pending_tool_responses: int = 0
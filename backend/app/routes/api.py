@@ -2,48 +2,130 @@
 API route definitions.
 """
 
-from quart import Blueprint, jsonify
+import itertools
+
+from quart import Blueprint, Response, request
 from datetime import datetime, timezone
 
 from app.utils.logging import log_capture
+from app.utils.serialization import json_response_body
 from app.data.travel_mock_data import GLOBAL_LOG_STORE, clear_global_log_store
 
 api_bp = Blueprint('api', __name__)
 
+# Version token for the combined log view, compared via ETag so polling
+# clients pay nothing while the tail is unchanged. The captured store is
+# a bounded ring, so its component is the total-appended counter (which
+# keeps growing across evictions) rather than the length; the generation
+# counter makes tokens from before a clear stale even when the counts
+# coincide again.
+_logs_clear_generation = 0
+_logs_cache_version = None
+_logs_cache_body = None
+
+
+def _current_logs_version() -> str:
+    """Build the version token for the current log snapshot."""
+    return f"{_logs_clear_generation}-{len(GLOBAL_LOG_STORE)}-{log_capture.appended_total}"
+
 
 @api_bp.route("/api/logs", methods=["GET"])
 async def get_logs():
-    """API endpoint to fetch captured logs."""
-    # Combine logs from global store and captured stdout logs
-    captured_logs = log_capture.get_logs()
-    combined_logs = list(GLOBAL_LOG_STORE) + captured_logs
-    
-    return jsonify(combined_logs)
+    """API endpoint to fetch captured logs.
+
+    Supports conditional polling: an ``If-None-Match`` header carrying
+    the previously returned ETag yields a 304 with no body, and
+    ``?since=<etag>`` returns only the entries appended after that
+    snapshot instead of the full combined list.
+    """
+    global _logs_cache_version, _logs_cache_body
+
+    version = _current_logs_version()
+
+    # Unchanged since the client's last poll: no copy, no serialization
+    if request.headers.get("If-None-Match") == version:
+        return "", 304, {"ETag": version}
+
+    since = request.args.get("since")
+    if since:
+        tail = _logs_tail_since(since)
+        if tail is not None:
+            return Response(
+                json_response_body(tail),
+                content_type="application/json",
+                headers={"ETag": version},
+            )
+
+    # Serialize the combined view once per version and reuse the bytes
+    # for every poller at that version
+    if version != _logs_cache_version:
+        combined_logs = list(GLOBAL_LOG_STORE) + list(log_capture.captured_logs)
+        _logs_cache_body = json_response_body(combined_logs)
+        _logs_cache_version = version
+
+    return Response(
+        _logs_cache_body,
+        content_type="application/json",
+        headers={"ETag": version},
+    )
+
+
+def _logs_tail_since(since: str):
+    """Return the log entries appended after the given version token.
+
+    Returns None when the token is malformed or predates a clear, in
+    which case the caller falls back to the full combined list.
+    """
+    try:
+        generation, store_len, appended_seen = (int(p) for p in since.split("-"))
+    except ValueError:
+        return None
+    if generation != _logs_clear_generation:
+        return None
+    captured_logs = log_capture.captured_logs
+    missing = log_capture.appended_total - appended_seen
+    if store_len > len(GLOBAL_LOG_STORE) or missing < 0:
+        return None
+    if missing > len(captured_logs):
+        # Entries past the client's snapshot were already evicted from
+        # the ring; fall back to the full combined view
+        return None
+    tail = GLOBAL_LOG_STORE[store_len:]
+    if missing:
+        tail = tail + list(
+            itertools.islice(captured_logs, len(captured_logs) - missing, None)
+        )
+    return tail
 
 
 @api_bp.route("/api/logs/clear", methods=["POST"])
 async def clear_logs():
     """API endpoint to clear all logs."""
+    global _logs_clear_generation
     try:
         clear_global_log_store()
         log_capture.clear_logs()  # Also clear captured logs
-        return jsonify({
+        _logs_clear_generation += 1
+        body = json_response_body({
             "status": "success",
             "message": "All logs cleared successfully",
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": datetime.now(timezone.utc)
         })
+        return Response(body, content_type="application/json")
     except Exception as e:
-        return jsonify({
+        body = json_response_body({
             "status": "error",
             "message": f"Failed to clear logs: {str(e)}",
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }), 500
+            "timestamp": datetime.now(timezone.utc)
+        })
+        return Response(body, status=500, content_type="application/json")
 
 
 @api_bp.route("/ping", methods=["GET", "HEAD"])
 async def ping():
     """Simple ping endpoint for connection quality testing."""
-    return jsonify({
-        "status": "ok", 
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
\ No newline at end of file
+    body = json_response_body({
+        "status": "ok",
+        "timestamp": datetime.now(timezone.utc)
+    })
+    return Response(body, content_type="application/json")
@@ -4,13 +4,16 @@ WebSocket route definitions.
 
 from quart import Blueprint
 
-from app.handlers.websocket_handler import WebSocketHandler
-
 websocket_bp = Blueprint('websocket', __name__)
 
 
 @websocket_bp.websocket("/listen")
 async def websocket_endpoint():
     """WebSocket endpoint for Gemini Live API communication."""
+    # Imported here (and cached by Python) so workers that never serve a
+    # websocket connection skip the Gemini SDK import entirely; create_app
+    # warms it in the background for those that will
+    from app.handlers.websocket_handler import WebSocketHandler
+
     handler = WebSocketHandler()
-    await handler.handle_connection()
\ No newline at end of file
+    await handler.handle_connection()
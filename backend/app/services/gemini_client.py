@@ -2,101 +2,39 @@
 Gemini client initialization and management.
 """
 
+import asyncio
+import logging
+import random
+
 import google.genai as genai
+import httpx
 from google.genai import types
 
 from app.core.config import settings
 from app.tools import travel_tool
 
+logger = logging.getLogger(__name__)
 
-class GeminiClientManager:
-    """Manages Gemini client initialization and configuration."""
-    
-    def __init__(self):
-        self._client = None
-        self._config = None
-    
-    def initialize_client(self) -> genai.Client:
-        """
-        Initialize and return the Gemini client.
-        
-        Returns:
-            genai.Client: Configured Gemini client
-            
-        Raises:
-            ValueError: If configuration is invalid
-            Exception: If client initialization fails
-        """
-        try:
-            settings.validate_configuration()
-            
-            if settings.GOOGLE_GENAI_USE_VERTEXAI:
-                self._client = genai.Client(
-                    vertexai=True,
-                    project=settings.GOOGLE_CLOUD_PROJECT_ID,
-                    location=settings.GOOGLE_CLOUD_LOCATION
-                )
-                print(
-                    f"✅ Gemini client initialized using Vertex AI "
-                    f"(Project: {settings.GOOGLE_CLOUD_PROJECT_ID}, "
-                    f"Location: {settings.GOOGLE_CLOUD_LOCATION})"
-                )
-            else:
-                self._client = genai.Client()
-                print("✅ Gemini client initialized using API Key")
-                
-            return self._client
-            
-        except Exception as e:
-            print(f"❌ Failed to initialize Gemini client: {e}")
-            raise
-    
-    def get_live_config(self) -> types.LiveConnectConfig:
-        """
-        Get the LiveConnectConfig for Gemini Live API.
-        
-        Returns:
-            types.LiveConnectConfig: Configuration for live connection
-        """
-        if self._config is None:
-            self._config = self._create_live_config()
-        return self._config
-    
-    def _create_live_config(self) -> types.LiveConnectConfig:
-        """Create the live connection configuration."""
-        return types.LiveConnectConfig(
-            response_modalities=["AUDIO"],
-            system_instruction=self._get_system_instruction(),
-            speech_config=types.SpeechConfig(
-                language_code=settings.LANGUAGE_CODE,
-                voice_config=types.VoiceConfig(
-                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                        voice_name=settings.VOICE_NAME
-                    )
-                )
-            ),
-            input_audio_transcription={},
-            output_audio_transcription={},
-            session_resumption=types.SessionResumptionConfig(handle=None),
-            context_window_compression=types.ContextWindowCompressionConfig(
-                sliding_window=types.SlidingWindow(),
-            ),
-            realtime_input_config=types.RealtimeInputConfig(
-                automatic_activity_detection=types.AutomaticActivityDetection(
-                    disabled=settings.DISABLE_VAD,
-                    start_of_speech_sensitivity=types.StartSensitivity.START_SENSITIVITY_LOW,
-                    end_of_speech_sensitivity=types.EndSensitivity.END_SENSITIVITY_LOW,
-                    prefix_padding_ms=100,
-                    silence_duration_ms=1200,
-                ),
-                turn_coverage=types.TurnCoverage.TURN_INCLUDES_ALL_INPUT
-            ),
-            tools=[travel_tool]
-        )
-    
-    def _get_system_instruction(self) -> str:
-        """Get the system instruction for the travel assistant."""
-        return """***Role and Persona***
+
+# HTTP options for the shared client: size the async connection pool
+# above httpx's default 100-connection cap and keep connections alive so
+# concurrent Live sessions neither queue on pool exhaustion nor pay a
+# fresh TCP+TLS handshake per request.
+_HTTP_OPTIONS = types.HttpOptions(
+    async_client_args={
+        "limits": httpx.Limits(
+            max_connections=512,
+            max_keepalive_connections=256,
+            keepalive_expiry=60,
+        ),
+    }
+)
+
+
+# System instruction for the travel assistant; a module-level constant
+# so the ~3 KB literal is materialized once at import instead of per
+# config build.
+_SYSTEM_INSTRUCTION = """***Role and Persona***
 - You are **Myra**, a female customer support agent for **Cymbol Travels**.
 - Your tone should be warm, polite, and outcome-driven, always representing the Cymbol Travels brand.
 - You must speak in clear, professional English throughout the conversation.
@@ -150,7 +88,162 @@ class GeminiClientManager:
 *   If you encounter a platform error, apologize briefly and retry. If the error persists, offer to connect the user to a human agent.
 *   If the user is abusive, politely end the conversation.
 """
+
+
+# The tool set never changes after import; a shared tuple keeps the
+# config build from allocating a fresh list per call and makes the
+# immutability explicit.
+_TOOLS = (travel_tool,)
+
+
+def _build_live_config() -> types.LiveConnectConfig:
+    """Create the live connection configuration."""
+    return types.LiveConnectConfig(
+        response_modalities=["AUDIO"],
+        system_instruction=_SYSTEM_INSTRUCTION,
+        speech_config=types.SpeechConfig(
+            language_code=settings.LANGUAGE_CODE,
+            voice_config=types.VoiceConfig(
+                prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                    voice_name=settings.VOICE_NAME
+                )
+            )
+        ),
+        input_audio_transcription={},
+        output_audio_transcription={},
+        session_resumption=types.SessionResumptionConfig(handle=None),
+        context_window_compression=types.ContextWindowCompressionConfig(
+            sliding_window=types.SlidingWindow(),
+        ),
+        realtime_input_config=types.RealtimeInputConfig(
+            automatic_activity_detection=types.AutomaticActivityDetection(
+                disabled=settings.DISABLE_VAD,
+                start_of_speech_sensitivity=types.StartSensitivity.START_SENSITIVITY_LOW,
+                end_of_speech_sensitivity=types.EndSensitivity.END_SENSITIVITY_LOW,
+                prefix_padding_ms=settings.PREFIX_PADDING_MS,
+                silence_duration_ms=settings.SILENCE_DURATION_MS,
+            ),
+            turn_coverage=types.TurnCoverage.TURN_INCLUDES_ALL_INPUT
+        ),
+        tools=_TOOLS
+    )
+
+
+# Half a second of silent 16-bit mono PCM at the 24 kHz output rate.
+# bytes(n) is zero-filled, which is exactly digital silence; callers
+# that need to pad or keep an audio stream warm can reuse this one
+# immutable buffer instead of allocating fresh zero buffers per use.
+_SILENCE_PCM = bytes(settings.OUTPUT_SAMPLE_RATE)  # 24000 bytes = 0.5s
+
+
+# Built once at import: the config tree (speech, VAD, tool schemas) is
+# identical for every session, so connects reuse one immutable instance
+# instead of re-running the pydantic constructors per manager call.
+_LIVE_CONFIG = _build_live_config()
+
+
+class GeminiClientManager:
+    """Manages Gemini client initialization and configuration."""
+
+    # The manager's only per-instance state is the cached client; slots
+    # drop the instance __dict__ and make accidental new attributes
+    # (e.g. a typo'd cache name) an immediate AttributeError
+    __slots__ = ("_client",)
+
+    def __init__(self):
+        self._client = None
+    
+    def initialize_client(self) -> genai.Client:
+        """
+        Initialize and return the Gemini client.
+        
+        Returns:
+            genai.Client: Configured Gemini client
+            
+        Raises:
+            ValueError: If configuration is invalid
+            Exception: If client initialization fails
+        """
+        # The client is connection-independent; reuse it so reconnect
+        # storms don't revalidate settings and rebuild the client per
+        # websocket handshake
+        if self._client is not None:
+            return self._client
+
+        try:
+            settings.validate_configuration()
+            
+            if settings.GOOGLE_GENAI_USE_VERTEXAI:
+                self._client = genai.Client(
+                    vertexai=True,
+                    project=settings.GOOGLE_CLOUD_PROJECT_ID,
+                    location=settings.GOOGLE_CLOUD_LOCATION,
+                    http_options=_HTTP_OPTIONS
+                )
+                logger.info(
+                    "✅ Gemini client initialized using Vertex AI (project=%s, location=%s)",
+                    settings.GOOGLE_CLOUD_PROJECT_ID,
+                    settings.GOOGLE_CLOUD_LOCATION,
+                )
+            else:
+                self._client = genai.Client(http_options=_HTTP_OPTIONS)
+                logger.info("✅ Gemini client initialized using API Key")
+                
+            return self._client
+            
+        except Exception:
+            logger.exception("❌ Failed to initialize Gemini client")
+            raise
     
+    async def initialize_client_async(self, max_attempts: int = 3) -> genai.Client:
+        """
+        Initialize the client, retrying transient failures with backoff.
+
+        Configuration errors (missing API key or project) fail fast -
+        they never heal by waiting. Anything else is treated as a
+        transient network/service blip and retried with exponential
+        backoff plus jitter via asyncio.sleep, so concurrent sessions
+        stay responsive while a retry is pending.
+
+        Returns:
+            genai.Client: Configured Gemini client
+        """
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return self.initialize_client()
+            except ValueError:
+                # Invalid configuration is unrecoverable; don't sleep on it
+                raise
+            except Exception:
+                if attempt == max_attempts:
+                    raise
+                delay = min(30.0, (2 ** (attempt - 1)) * (1.0 + random.random() * 0.5))
+                logger.warning(
+                    "Gemini client init failed (attempt %d/%d), retrying in %.1fs",
+                    attempt, max_attempts, delay,
+                )
+                await asyncio.sleep(delay)
+
+    def get_live_config(self) -> types.LiveConnectConfig:
+        """
+        Get the LiveConnectConfig for Gemini Live API.
+        
+        Returns:
+            types.LiveConnectConfig: Configuration for live connection
+        """
+        return _LIVE_CONFIG
+    
+    
+    @property
+    def live_config(self) -> types.LiveConnectConfig:
+        """Get the memoized live connection configuration."""
+        return self.get_live_config()
+
+    @property
+    def silence_pcm(self) -> bytes:
+        """Get the shared half-second silence buffer (16-bit mono PCM)."""
+        return _SILENCE_PCM
+
     @property
     def client(self) -> genai.Client:
         """Get the initialized client."""
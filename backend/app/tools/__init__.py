@@ -5,6 +5,8 @@ This module provides all the necessary components for travel booking tools,
 including function declarations, implementations, and the tool registry.
 """
 
+from types import MappingProxyType
+
 from .registry import travel_tool, available_functions
 from .implementations import (
     take_a_nap,
@@ -20,9 +22,15 @@ from .implementations import (
     Webcheckin_And_Boarding_Pass_Agent,
 )
 
+# Read-only view over the registry's function map, built once at import.
+# Handlers share this instead of assembling their own name-to-function
+# dict per connection.
+AVAILABLE_FUNCTIONS = MappingProxyType(available_functions)
+
 __all__ = [
     "travel_tool",
     "available_functions",
+    "AVAILABLE_FUNCTIONS",
     "take_a_nap",
     "NameCorrectionAgent",
     "SpecialClaimAgent",
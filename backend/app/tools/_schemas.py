@@ -0,0 +1,37 @@
+"""
+Shared leaf schemas for tool declarations.
+
+Several declarations repeat the same leaf fields (airport codes,
+passenger first/last names, booking references). Building each leaf
+once here and referencing it from every declaration cuts the pydantic
+construction work at import and keeps a field's description in one
+place. The instances are never mutated after import, so sharing them
+across declaration trees is safe.
+"""
+
+from google.genai import types
+
+ORIGIN_AIRPORT = types.Schema(
+    type=types.Type.STRING,
+    description="Airport Code of the origin city (e.g., DEL).",
+)
+
+DESTINATION_AIRPORT = types.Schema(
+    type=types.Type.STRING,
+    description="Airport Code of the destination city (e.g., BOM).",
+)
+
+FIRST_NAME = types.Schema(
+    type=types.Type.STRING,
+    description="First Name of the passenger.",
+)
+
+LAST_NAME = types.Schema(
+    type=types.Type.STRING,
+    description="Last Name of the passenger.",
+)
+
+BOOKING_ID_OR_PNR = types.Schema(
+    type=types.Type.STRING,
+    description="The booking ID or PNR of the user itinerary.",
+)
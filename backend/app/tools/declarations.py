@@ -8,6 +8,35 @@ to understand what functions are available and how to call them.
 
 from google.genai import types
 
+from ._schemas import (
+    ORIGIN_AIRPORT,
+    DESTINATION_AIRPORT,
+    FIRST_NAME,
+    LAST_NAME,
+    BOOKING_ID_OR_PNR,
+)
+
+
+# Enum value sets, hoisted to module level so declarations that repeat a
+# set (QUOTE/CONFIRM appears in both date-change and cancellation) share
+# one tuple instead of allocating a fresh list literal per declaration.
+_CORRECTION_TYPES = (
+    "NAME_CORRECTION",
+    "NAME_SWAP",
+    "GENDER_SWAP",
+    "MAIDEN_NAME_CHANGE",
+    "REMOVE_TITLE",
+)
+_CLAIM_TYPES = (
+    "FLIGHT_NOT_OPERATIONAL",
+    "MEDICAL_EMERGENCY",
+    "TICKET_CANCELLED_WITH_AIRLINE",
+)
+_REFUND_OPERATIONS = ("CANCELLATION", "DATE_CHANGE")
+_QUOTE_OR_CONFIRM = ("QUOTE", "CONFIRM")
+_HUMAN_HANDOFF_REASONS = ("FRUSTRATED", "UNABLE_TO_HELP")
+_CANCEL_SCOPES = ("NOT_MENTIONED", "FULL", "PARTIAL")
+
 
 # Function Declarations
 
@@ -30,20 +59,10 @@ NameCorrectionAgent_declaration = types.FunctionDeclaration(
             "correction_type": types.Schema(
                 type=types.Type.STRING,
                 description="Type of name correction required.",
-                enum=[
-                    "NAME_CORRECTION",
-                    "NAME_SWAP",
-                    "GENDER_SWAP",
-                    "MAIDEN_NAME_CHANGE",
-                    "REMOVE_TITLE",
-                ],
-            ),
-            "fn": types.Schema(
-                type=types.Type.STRING, description="First Name of the passenger."
-            ),
-            "ln": types.Schema(
-                type=types.Type.STRING, description="Last Name of the passenger."
+                enum=_CORRECTION_TYPES,
             ),
+            "fn": FIRST_NAME,
+            "ln": LAST_NAME,
         },
         required=["correction_type", "fn", "ln"],
     ),
@@ -58,11 +77,7 @@ SpecialClaimAgent_declaration = types.FunctionDeclaration(
             "claim_type": types.Schema(
                 type=types.Type.STRING,
                 description="Type of special claim being filed by the user",
-                enum=[
-                    "FLIGHT_NOT_OPERATIONAL",
-                    "MEDICAL_EMERGENCY",
-                    "TICKET_CANCELLED_WITH_AIRLINE",
-                ],
+                enum=_CLAIM_TYPES,
             )
         },
         required=["claim_type"],
@@ -81,10 +96,7 @@ Eticket_Sender_Agent_declaration = types.FunctionDeclaration(
     parameters=types.Schema(
         type=types.Type.OBJECT,
         properties={
-            "booking_id_or_pnr": types.Schema(
-                type=types.Type.STRING,
-                description="The booking ID or PNR of the user itinerary.",
-            )
+            "booking_id_or_pnr": BOOKING_ID_OR_PNR
         },
         required=["booking_id_or_pnr"],
     ),
@@ -99,7 +111,7 @@ ObservabilityAgent_declaration = types.FunctionDeclaration(
             "operation_type": types.Schema(
                 type=types.Type.STRING,
                 description="Type of operation_type being filed by the user",
-                enum=["CANCELLATION", "DATE_CHANGE"],
+                enum=_REFUND_OPERATIONS,
             )
         },
         required=["operation_type"],
@@ -115,7 +127,7 @@ DateChangeAgent_declaration = types.FunctionDeclaration(
             "action": types.Schema(
                 type=types.Type.STRING,
                 description="Choose QUOTE to fetch penalty/fare difference information, CONFIRM to execute the date change.",
-                enum=["QUOTE", "CONFIRM"],
+                enum=_QUOTE_OR_CONFIRM,
             ),
             "sector_info": types.Schema(
                 type=types.Type.ARRAY,
@@ -123,14 +135,8 @@ DateChangeAgent_declaration = types.FunctionDeclaration(
                 items=types.Schema(
                     type=types.Type.OBJECT,
                     properties={
-                        "origin": types.Schema(
-                            type=types.Type.STRING,
-                            description="Airport Code of the origin city (e.g., DEL).",
-                        ),
-                        "destination": types.Schema(
-                            type=types.Type.STRING,
-                            description="Airport Code of the destination city (e.g., BOM).",
-                        ),
+                        "origin": ORIGIN_AIRPORT,
+                        "destination": DESTINATION_AIRPORT,
                         "newDate": types.Schema(
                             type=types.Type.STRING,
                             description="New date for the journey in YYYY-MM-DD format (e.g., 2024-01-15).",
@@ -153,7 +159,7 @@ Connect_To_Human_Tool_declaration = types.FunctionDeclaration(
             "reason_of_invoke": types.Schema(
                 type=types.Type.STRING,
                 description="Was the user frustrated or you are not able to help.",
-                enum=["FRUSTRATED", "UNABLE_TO_HELP"],
+                enum=_HUMAN_HANDOFF_REASONS,
             ),
             "frustration_score": types.Schema(
                 type=types.Type.STRING,
@@ -177,13 +183,13 @@ Booking_Cancellation_Agent_declaration = types.FunctionDeclaration(
             "action": types.Schema(
                 type=types.Type.STRING,
                 description="Choose QUOTE to fetch refund/penalty information, CONFIRM to execute the cancellation.",
-                enum=["QUOTE", "CONFIRM"],
+                enum=_QUOTE_OR_CONFIRM,
                 default="QUOTE",
             ),
             "cancel_scope": types.Schema(
                 type=types.Type.STRING,
                 description="Defaults to NOT_MENTIONED. Type of cancellation - FULL or PARTIAL. Don't ask this information upfront. ONLY fill when user mentions about it.",
-                enum=["NOT_MENTIONED", "FULL", "PARTIAL"],
+                enum=_CANCEL_SCOPES,
                 default="NOT_MENTIONED",
             ),
             "otp": types.Schema(
@@ -200,14 +206,8 @@ Booking_Cancellation_Agent_declaration = types.FunctionDeclaration(
                         "journey": types.Schema(
                             type=types.Type.OBJECT,
                             properties={
-                                "from_city": types.Schema(
-                                    type=types.Type.STRING,
-                                    description="Airport Code of the origin city (e.g., DEL).",
-                                ),
-                                "to_city": types.Schema(
-                                    type=types.Type.STRING,
-                                    description="Airport Code of the destination city (e.g., BOM).",
-                                ),
+                                "from_city": ORIGIN_AIRPORT,
+                                "to_city": DESTINATION_AIRPORT,
                             },
                         ),
                         "pax_to_cancel": types.Schema(
@@ -216,14 +216,8 @@ Booking_Cancellation_Agent_declaration = types.FunctionDeclaration(
                             items=types.Schema(
                                 type=types.Type.OBJECT,
                                 properties={
-                                    "fn": types.Schema(
-                                        type=types.Type.STRING,
-                                        description="First Name of the passenger.",
-                                    ),
-                                    "ln": types.Schema(
-                                        type=types.Type.STRING,
-                                        description="Last Name of the passenger.",
-                                    ),
+                                    "fn": FIRST_NAME,
+                                    "ln": LAST_NAME,
                                 },
                             ),
                         ),
@@ -241,10 +235,7 @@ Flight_Booking_Details_Agent_declaration = types.FunctionDeclaration(
     parameters=types.Schema(
         type=types.Type.OBJECT,
         properties={
-            "booking_id_or_pnr": types.Schema(
-                type=types.Type.STRING,
-                description="The booking ID or PNR of the user itinerary.",
-            )
+            "booking_id_or_pnr": BOOKING_ID_OR_PNR
         },
         required=["booking_id_or_pnr"],
     ),
@@ -266,14 +257,8 @@ Webcheckin_And_Boarding_Pass_Agent_declaration = types.FunctionDeclaration(
                 items=types.Schema(
                     type=types.Type.OBJECT,
                     properties={
-                        "origin": types.Schema(
-                            type=types.Type.STRING,
-                            description="Airport Code of the origin city (e.g., DEL).",
-                        ),
-                        "destination": types.Schema(
-                            type=types.Type.STRING,
-                            description="Airport Code of the destination city (e.g., BOM).",
-                        ),
+                        "origin": ORIGIN_AIRPORT,
+                        "destination": DESTINATION_AIRPORT,
                         "isAllPax": types.Schema(
                             type=types.Type.STRING,
                             description="Set to true if user wants web check-in for all passengers on this journey, false if for specific passengers only.",
@@ -285,14 +270,8 @@ Webcheckin_And_Boarding_Pass_Agent_declaration = types.FunctionDeclaration(
                             items=types.Schema(
                                 type=types.Type.OBJECT,
                                 properties={
-                                    "fn": types.Schema(
-                                        type=types.Type.STRING,
-                                        description="First Name of the passenger.",
-                                    ),
-                                    "ln": types.Schema(
-                                        type=types.Type.STRING,
-                                        description="Last Name of the passenger.",
-                                    ),
+                                    "fn": FIRST_NAME,
+                                    "ln": LAST_NAME,
                                 },
                                 required=["fn", "ln"],
                             ),
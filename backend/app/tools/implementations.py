@@ -6,18 +6,14 @@ Each function corresponds to a declared tool in declarations.py and provides
 the business logic for handling various travel-related operations.
 """
 
-import json
 from datetime import datetime, timezone
+import functools
 import logging
 import asyncio
+from app.core.config import settings
 from app.data.travel_mock_data import get_booking_details, send_eticket, validate_booking_exists
+from app.utils.serialization import json_dumps_bytes
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(name)s - %(funcName)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
 logger = logging.getLogger(__name__)
 
 
@@ -26,8 +22,16 @@ def _log_tool_event(
     event_type: str, tool_name: str, parameters: dict, response: dict = None
 ):
     """Helper function to create and print a structured log entry for tool events."""
+    # Tool events are INFO-level telemetry; skip the dict build,
+    # timestamp formatting and JSON encoding entirely when the app has
+    # raised this logger above INFO
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    # The datetime goes into the payload unformatted; the orjson
+    # encoder renders it to ISO-8601 in C, which beats both isoformat()
+    # and a cached-per-second string without losing precision
     log_payload = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": datetime.now(timezone.utc),
         "log_type": "TOOL_EVENT",
         "event_subtype": event_type,
         "tool_function_name": tool_name,
@@ -35,306 +39,251 @@ def _log_tool_event(
     }
     if response is not None:
         log_payload["response_received"] = response
-    print(json.dumps(log_payload))
+    # orjson-backed encoder; the line still goes through print so the
+    # stdout tee keeps capturing it as a structured TOOL_EVENT
+    print(json_dumps_bytes(log_payload).decode())
+
+
+# --- Background Task Dispatcher ---
+
+# Strong references to in-flight background tasks: the event loop only
+# keeps a weak reference to tasks, so a task whose handle is dropped at
+# create_task can be garbage-collected mid-flight and silently never
+# queue its completion message. Tasks discard themselves when done.
+_BG_TASKS: set = set()
+
+# Per-tool completion texts, compiled once at import. Placeholders are
+# filled from the tool's logged parameters plus {resp}, the
+# JSON-encoded result, so the per-call work is one format_map instead
+# of an f-string rebuilt inside each coroutine.
+_SYS_TMPL = {
+    "NameCorrectionAgent": "[SYSTEM]: The name correction for {fn} {ln} is complete. Details: {resp}. Please inform the user.",
+    "SpecialClaimAgent": "[SYSTEM]: The special claim of type {claim_type} has been filed. Details: {resp}. Please inform the user.",
+    "Enquiry_Tool": "[SYSTEM]: The enquiry has been resolved. Details: {resp}. Please inform the user.",
+    "Eticket_Sender_Agent": "[SYSTEM]: The e-ticket for booking {booking_id_or_pnr} has been sent. Details: {resp}. Please inform the user.",
+    "ObservabilityAgent": "[SYSTEM]: The refund status for {operation_type} is now available. Details: {resp}. Please inform the user.",
+    "DateChangeAgent": "[SYSTEM]: The date change action '{action}' has been processed. Details: {resp}. Please inform the user.",
+    "Connect_To_Human_Tool": "[SYSTEM]: The connection to a human agent has been initiated. Details: {resp}. Please inform the user.",
+    "Booking_Cancellation_Agent": "[SYSTEM]: The booking cancellation action '{action}' has been processed. Details: {resp}. Please inform the user.",
+    "Flight_Booking_Details_Agent": "[SYSTEM]: The booking details for {booking_id_or_pnr} are now available. Here they are: {resp}. Please present this to the user.",
+    "Webcheckin_And_Boarding_Pass_Agent": "[SYSTEM]: The web check-in and boarding pass request has been processed. Details: {resp}. Please inform the user.",
+    "take_a_nap": "[SYSTEM]: The nap is over. Details: {resp}. Please inform the user.",
+}
+
+# Shared mock delay for the standard background tools (take_a_nap keeps
+# its own longer nap)
+_BACKGROUND_DELAY = settings.TOOL_MOCK_DELAY_SECONDS
+
+
+def _spawn(queue, tool_name, params, responder, delay=_BACKGROUND_DELAY) -> asyncio.Task:
+    """Schedule _run_background, pinning the task until it completes."""
+    task = asyncio.create_task(
+        _run_background(queue, tool_name, params, responder, delay),
+        name=f"ToolBackground-{tool_name}",
+    )
+    _BG_TASKS.add(task)
+    task.add_done_callback(_BG_TASKS.discard)
+    return task
+
+
+async def _run_background(queue, tool_name, params, responder, delay=_BACKGROUND_DELAY):
+    """
+    Shared body for every delayed tool: wait out the mock delay, log the
+    start, build the result, queue a [SYSTEM] message for the model, and
+    log the end.
+
+    Every tool used to carry its own copy of this sequence; one
+    dispatcher keeps a single code path to optimize. ``responder`` is a
+    zero-argument callable that builds the result dict (pure - no
+    delays, no logging); the completion text comes from the _SYS_TMPL
+    table, formatted with the tool's parameters plus ``resp``, the
+    JSON-encoded result.
+    """
+    await asyncio.sleep(delay)
+    _log_tool_event("BACKGROUND_TASK_START", tool_name, params)
+    response = responder()
+    text = _SYS_TMPL[tool_name].format_map(
+        {**params, "resp": json_dumps_bytes(response).decode()}
+    )
+    system_message = {"role": "user", "parts": [{"text": text}]}
+    await queue.put(system_message)
+    _log_tool_event("BACKGROUND_TASK_END", tool_name, params, response)
 
 
-# --- Asynchronous Task Implementations ---
+# --- Response Builders (pure functions; no delay, no logging) ---
 
-async def _name_correction_later(queue, correction_type: str, fn: str, ln: str):
-    await asyncio.sleep(20)
-    tool_name = "NameCorrectionAgent"
-    params_sent = {"correction_type": correction_type, "fn": fn, "ln": ln}
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-    response = {
+def _respond_name_correction(correction_type: str, fn: str, ln: str) -> dict:
+    return {
         "status": "SUCCESS",
         "message": f"Name correction of type {correction_type} for {fn} {ln} has been processed.",
     }
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The name correction for {fn} {ln} is complete. Details: {json.dumps(response)}. Please inform the user."
-            }
-        ],
-    }
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
 
-async def _special_claim_later(queue, claim_type: str):
-    await asyncio.sleep(20)
-    tool_name = "SpecialClaimAgent"
-    params_sent = {"claim_type": claim_type}
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-    response = {
+def _respond_special_claim(claim_type: str) -> dict:
+    return {
         "status": "SUCCESS",
         "message": f"Special claim of type {claim_type} has been filed.",
     }
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The special claim of type {claim_type} has been filed. Details: {json.dumps(response)}. Please inform the user."
-            }
-        ],
-    }
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
 
-async def _enquiry_tool_later(queue):
-    await asyncio.sleep(20)
-    tool_name = "Enquiry_Tool"
-    params_sent = {}
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-    response = {
+def _respond_enquiry() -> dict:
+    return {
         "status": "SUCCESS",
         "message": "This is a mock response to your enquiry.",
     }
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The enquiry has been resolved. Details: {json.dumps(response)}. Please inform the user."
-            }
-        ],
-    }
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
-
-async def _eticket_sender_later(queue, booking_id_or_pnr: str):
-    await asyncio.sleep(20)
-    tool_name = "Eticket_Sender_Agent"
-    params_sent = {"booking_id_or_pnr": booking_id_or_pnr}
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-    response = send_eticket(booking_id_or_pnr)
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The e-ticket for booking {booking_id_or_pnr} has been sent. Details: {json.dumps(response)}. Please inform the user."
-            }
-        ],
-    }
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
 
-async def _observability_agent_later(queue, operation_type: str):
-    await asyncio.sleep(20)
-    tool_name = "ObservabilityAgent"
-    params_sent = {"operation_type": operation_type}
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-    response = {
+def _respond_observability(operation_type: str) -> dict:
+    return {
         "status": "SUCCESS",
         "message": f"Refund status for {operation_type} is being tracked.",
     }
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The refund status for {operation_type} is now available. Details: {json.dumps(response)}. Please inform the user."
-            }
-        ],
-    }
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
 
-async def _date_change_agent_later(queue, action: str, sector_info: list):
-    await asyncio.sleep(20)
-    tool_name = "DateChangeAgent"
-    params_sent = {"action": action, "sector_info": sector_info}
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-    response = {
+def _respond_date_change(action: str) -> dict:
+    return {
         "status": "SUCCESS",
         "message": f"Date change action '{action}' has been processed for the provided sectors.",
     }
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The date change action '{action}' has been processed. Details: {json.dumps(response)}. Please inform the user."
-            }
-        ],
-    }
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
-
-async def _connect_to_human_tool_later(queue, reason_of_invoke: str, frustration_score: str = None):
-    await asyncio.sleep(20)
-    tool_name = "Connect_To_Human_Tool"
-    params_sent = {
-        "reason_of_invoke": reason_of_invoke,
-        "frustration_score": frustration_score,
-    }
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-    response = {"status": "SUCCESS", "message": "Connecting you to a human agent..."}
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The connection to a human agent has been initiated. Details: {json.dumps(response)}. Please inform the user."
-            }
-        ],
-    }
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
-
-async def _booking_cancellation_agent_later(queue, booking_id_or_pnr: str, action: str, cancel_scope: str, otp: str, partial_info: list):
-    await asyncio.sleep(20)
-    tool_name = "Booking_Cancellation_Agent"
-    params_sent = {
-        "booking_id_or_pnr": booking_id_or_pnr,
-        "action": action,
-        "cancel_scope": cancel_scope,
-        "otp": otp,
-        "partial_info": partial_info,
-    }
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-    validation = validate_booking_exists(booking_id_or_pnr)
-    if not validation["is_valid"]:
-        response = {
-            "status": validation["status"],
-            "message": validation["message"],
+
+def _respond_human_handoff() -> dict:
+    return {"status": "SUCCESS", "message": "Connecting you to a human agent..."}
+
+def _respond_cancellation(booking: dict, booking_id_or_pnr: str, action: str) -> dict:
+    if action == "QUOTE":
+        total_cost = booking['total_cost']
+        refund = total_cost * 0.8
+        penalty = total_cost - refund
+        return {
+            "status": "SUCCESS",
+            "message": f"Cancellation quote for booking {booking_id_or_pnr}: Refund amount ₹{refund:.0f}, Penalty ₹{penalty:.0f}",
+            "refund_amount": refund,
+            "penalty": penalty,
+            "currency": booking['currency'],
         }
-    else:
-        booking = validation["booking"]
-        if action == "QUOTE":
-            response = {
-                "status": "SUCCESS",
-                "message": f"Cancellation quote for booking {booking_id_or_pnr}: Refund amount ₹{booking['total_cost'] * 0.8:.0f}, Penalty ₹{booking['total_cost'] * 0.2:.0f}",
-                "refund_amount": booking['total_cost'] * 0.8,
-                "penalty": booking['total_cost'] * 0.2,
-                "currency": booking['currency'],
-            }
-        else:
-            response = {
-                "status": "SUCCESS",
-                "message": f"Booking {booking_id_or_pnr} has been successfully cancelled. Refund will be processed in 5-7 business days.",
-                "booking_cancelled": True,
-            }
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The booking cancellation action '{action}' has been processed. Details: {json.dumps(response)}. Please inform the user."
-            }
-        ],
+    return {
+        "status": "SUCCESS",
+        "message": f"Booking {booking_id_or_pnr} has been successfully cancelled. Refund will be processed in 5-7 business days.",
+        "booking_cancelled": True,
     }
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
 
-async def _webcheckin_and_boarding_pass_agent_later(queue, booking_id_or_pnr: str, journeys: list):
-    await asyncio.sleep(20)
-    tool_name = "Webcheckin_And_Boarding_Pass_Agent"
-    params_sent = {"booking_id_or_pnr": booking_id_or_pnr, "journeys": journeys}
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-    validation = validate_booking_exists(booking_id_or_pnr)
-    if not validation["is_valid"]:
-        response = {
-            "status": validation["status"],
-            "message": validation["message"],
+def _respond_webcheckin(booking: dict, booking_id_or_pnr: str, journeys: list) -> dict:
+    if booking["type"] != "flight":
+        return {
+            "status": "INVALID_BOOKING_TYPE",
+            "message": f"Web check-in is only available for flight bookings. Booking {booking_id_or_pnr} is a {booking['type']} booking.",
         }
-    else:
-        booking = validation["booking"]
-        if booking["type"] != "flight":
-            response = {
-                "status": "INVALID_BOOKING_TYPE",
-                "message": f"Web check-in is only available for flight bookings. Booking {booking_id_or_pnr} is a {booking['type']} booking.",
-            }
-        else:
-            response = {
-                "status": "SUCCESS",
-                "message": f"Web check-in completed for booking {booking_id_or_pnr}. Boarding passes have been sent to your registered email and mobile number.",
-                "booking_type": booking["type"],
-                "journeys_processed": len(journeys),
-            }
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The web check-in and boarding pass request has been processed. Details: {json.dumps(response)}. Please inform the user."
-            }
-        ],
+    return {
+        "status": "SUCCESS",
+        "message": f"Web check-in completed for booking {booking_id_or_pnr}. Boarding passes have been sent to your registered email and mobile number.",
+        "booking_type": booking["type"],
+        "journeys_processed": len(journeys),
     }
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
 
-async def _take_a_nap_later(queue):
-    await asyncio.sleep(30)
-    tool_name = "take_a_nap"
-    params_sent = {}
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-    response = {
+def _respond_nap() -> dict:
+    return {
         "status": "SUCCESS",
         "message": "I have slept really good, thanks for waking me up! 😴💤",
         "sleep_duration": "30 seconds",
         "wake_up_time": datetime.now(timezone.utc).isoformat()
     }
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The nap is over. Details: {json.dumps(response)}. Please inform the user."
-            }
-        ],
-    }
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
 
-async def _fetch_and_send_details_later(queue, booking_id_or_pnr: str):
-    """Simulates a long-running task to fetch booking details and sends them back to the session."""
-    await asyncio.sleep(20)
-    tool_name = "Flight_Booking_Details_Agent"
-    params_sent = {"booking_id_or_pnr": booking_id_or_pnr}
-    _log_tool_event("BACKGROUND_TASK_START", tool_name, params_sent)
-
-    response = get_booking_details(booking_id_or_pnr)
-
-    # Create a system message to send back to the model
-    system_message = {
-        "role": "user",
-        "parts": [
-            {
-                "text": f"[SYSTEM]: The booking details for {booking_id_or_pnr} are now available. Here they are: {json.dumps(response)}. Please present this to the user."
-            }
-        ],
-    }
 
-    await queue.put(system_message)
-    _log_tool_event("BACKGROUND_TASK_END", tool_name, params_sent, response)
+# --- Immediate PENDING Acknowledgements ---
+# The constant acknowledgements are built once at import and returned
+# as-is (tool results are treated as read-only by the dispatch layer);
+# the parameterized ones keep a precompiled %-template so each call
+# only formats the final message instead of rebuilding the dict text.
+
+_PENDING_NAME_CORRECTION = {"status": "PENDING", "message": "Processing name correction..."}
+_PENDING_SPECIAL_CLAIM = {"status": "PENDING", "message": "Filing special claim..."}
+_PENDING_ENQUIRY = {"status": "PENDING", "message": "Looking up information for your enquiry..."}
+_PENDING_HUMAN_HANDOFF = {"status": "PENDING", "message": "Connecting you to a human agent..."}
+_PENDING_NAP = {"status": "PENDING", "message": "I'm going to take a short nap... I'll be back in 30 seconds."}
+
+_ETICKET_PENDING_TMPL = "Sending e-ticket for booking %s..."
+_REFUND_PENDING_TMPL = "Tracking refund status for %s..."
+_DATE_CHANGE_PENDING_TMPL = "Processing date change action '%s'..."
+_CANCELLATION_PENDING_TMPL = "Processing cancellation action '%s' for booking %s..."
+_DETAILS_PENDING_TMPL = (
+    "I'm fetching the details for booking %s. It might take a moment. "
+    "You can continue our conversation in the meantime."
+)
+_WEBCHECKIN_PENDING_TMPL = "Processing web check-in for booking %s..."
 
 
 # --- Tool Function Implementations (Synchronous Wrappers) ---
 
 def NameCorrectionAgent(session, queue, correction_type: str, fn: str, ln: str) -> dict:
-    asyncio.create_task(_name_correction_later(queue, correction_type, fn, ln))
-    return {"status": "PENDING", "message": "Processing name correction..."}
+    _spawn(
+        queue, "NameCorrectionAgent",
+        {"correction_type": correction_type, "fn": fn, "ln": ln},
+        functools.partial(_respond_name_correction, correction_type, fn, ln),
+    )
+    return _PENDING_NAME_CORRECTION
 
 def SpecialClaimAgent(session, queue, claim_type: str) -> dict:
-    asyncio.create_task(_special_claim_later(queue, claim_type))
-    return {"status": "PENDING", "message": "Filing special claim..."}
+    _spawn(
+        queue, "SpecialClaimAgent",
+        {"claim_type": claim_type},
+        functools.partial(_respond_special_claim, claim_type),
+    )
+    return _PENDING_SPECIAL_CLAIM
 
 def Enquiry_Tool(session, queue) -> dict:
-    asyncio.create_task(_enquiry_tool_later(queue))
-    return {"status": "PENDING", "message": "Looking up information for your enquiry..."}
+    _spawn(
+        queue, "Enquiry_Tool", {}, _respond_enquiry,
+    )
+    return _PENDING_ENQUIRY
 
 def Eticket_Sender_Agent(session, queue, booking_id_or_pnr: str) -> dict:
-    asyncio.create_task(_eticket_sender_later(queue, booking_id_or_pnr))
-    return {"status": "PENDING", "message": f"Sending e-ticket for booking {booking_id_or_pnr}..."}
+    _spawn(
+        queue, "Eticket_Sender_Agent",
+        {"booking_id_or_pnr": booking_id_or_pnr},
+        functools.partial(send_eticket, booking_id_or_pnr),
+    )
+    return {"status": "PENDING", "message": _ETICKET_PENDING_TMPL % booking_id_or_pnr}
 
 def ObservabilityAgent(session, queue, operation_type: str) -> dict:
-    asyncio.create_task(_observability_agent_later(queue, operation_type))
-    return {"status": "PENDING", "message": f"Tracking refund status for {operation_type}..."}
+    _spawn(
+        queue, "ObservabilityAgent",
+        {"operation_type": operation_type},
+        functools.partial(_respond_observability, operation_type),
+    )
+    return {"status": "PENDING", "message": _REFUND_PENDING_TMPL % operation_type}
 
 def DateChangeAgent(session, queue, action: str, sector_info: list) -> dict:
-    asyncio.create_task(_date_change_agent_later(queue, action, sector_info))
-    return {"status": "PENDING", "message": f"Processing date change action '{action}'..."}
+    _spawn(
+        queue, "DateChangeAgent",
+        {"action": action, "sector_info": sector_info},
+        functools.partial(_respond_date_change, action),
+    )
+    return {"status": "PENDING", "message": _DATE_CHANGE_PENDING_TMPL % action}
 
 def Connect_To_Human_Tool(session, queue, reason_of_invoke: str, frustration_score: str = None) -> dict:
-    asyncio.create_task(_connect_to_human_tool_later(queue, reason_of_invoke, frustration_score))
-    return {"status": "PENDING", "message": "Connecting you to a human agent..."}
+    _spawn(
+        queue, "Connect_To_Human_Tool",
+        {"reason_of_invoke": reason_of_invoke, "frustration_score": frustration_score},
+        _respond_human_handoff,
+    )
+    return _PENDING_HUMAN_HANDOFF
 
 def Booking_Cancellation_Agent(session, queue, booking_id_or_pnr: str, action: str, cancel_scope: str = "NOT_MENTIONED", otp: str = "", partial_info: list = None) -> dict:
-    asyncio.create_task(_booking_cancellation_agent_later(queue, booking_id_or_pnr, action, cancel_scope, otp, partial_info))
-    return {"status": "PENDING", "message": f"Processing cancellation action '{action}' for booking {booking_id_or_pnr}..."}
+    # Validate up front: an unknown booking fails in the acknowledgement
+    # instead of making the user wait out the mock delay for an
+    # INVALID result, and the validated booking rides into the
+    # background task so it isn't looked up twice
+    validation = validate_booking_exists(booking_id_or_pnr)
+    if not validation["is_valid"]:
+        return {"status": validation["status"], "message": validation["message"]}
+    _spawn(
+        queue, "Booking_Cancellation_Agent",
+        {
+            "booking_id_or_pnr": booking_id_or_pnr,
+            "action": action,
+            "cancel_scope": cancel_scope,
+            "otp": otp,
+            "partial_info": partial_info,
+        },
+        functools.partial(_respond_cancellation, validation["booking"], booking_id_or_pnr, action),
+    )
+    return {"status": "PENDING", "message": _CANCELLATION_PENDING_TMPL % (action, booking_id_or_pnr)}
 
 def Flight_Booking_Details_Agent(session, queue, booking_id_or_pnr: str) -> dict:
     """
@@ -345,20 +294,34 @@ def Flight_Booking_Details_Agent(session, queue, booking_id_or_pnr: str) -> dict
     _log_tool_event("INVOCATION_START", tool_name, params_sent)
 
     # Start the background task
-    asyncio.create_task(_fetch_and_send_details_later(queue, booking_id_or_pnr))
+    _spawn(
+        queue, tool_name, params_sent,
+        functools.partial(get_booking_details, booking_id_or_pnr),
+    )
 
     # Immediately return a pending response
     response = {
         "status": "PENDING",
-        "message": f"I'm fetching the details for booking {booking_id_or_pnr}. It might take a moment. You can continue our conversation in the meantime.",
+        "message": _DETAILS_PENDING_TMPL % booking_id_or_pnr,
     }
     _log_tool_event("INVOCATION_PENDING", tool_name, params_sent, response)
     return response
 
 def Webcheckin_And_Boarding_Pass_Agent(session, queue, booking_id_or_pnr: str, journeys: list) -> dict:
-    asyncio.create_task(_webcheckin_and_boarding_pass_agent_later(queue, booking_id_or_pnr, journeys))
-    return {"status": "PENDING", "message": f"Processing web check-in for booking {booking_id_or_pnr}..."}
+    # Same fail-fast shape as the cancellation agent
+    validation = validate_booking_exists(booking_id_or_pnr)
+    if not validation["is_valid"]:
+        return {"status": validation["status"], "message": validation["message"]}
+    _spawn(
+        queue, "Webcheckin_And_Boarding_Pass_Agent",
+        {"booking_id_or_pnr": booking_id_or_pnr, "journeys": journeys},
+        functools.partial(_respond_webcheckin, validation["booking"], booking_id_or_pnr, journeys),
+    )
+    return {"status": "PENDING", "message": _WEBCHECKIN_PENDING_TMPL % booking_id_or_pnr}
 
 def take_a_nap(session, queue) -> dict:
-    asyncio.create_task(_take_a_nap_later(queue))
-    return {"status": "PENDING", "message": "I'm going to take a short nap... I'll be back in 30 seconds."}
\ No newline at end of file
+    _spawn(
+        queue, "take_a_nap", {}, _respond_nap,
+        delay=30,
+    )
+    return _PENDING_NAP
@@ -7,10 +7,18 @@ Enhanced with callback-based execution for non-blocking function calls.
 """
 
 import asyncio
+import concurrent.futures
+import functools
+import itertools
+import os
+import secrets
+import sys
 import time
-import uuid
+from types import MappingProxyType
 from typing import Dict, Callable, Any, Optional
 from google.genai import types
+from app.core.config import settings
+from app.utils.logging import log_capture
 from .declarations import (
     take_a_nap_declaration,
     NameCorrectionAgent_declaration,
@@ -39,9 +47,11 @@ from .implementations import (
 )
 
 
-# Tool instance containing all function declarations
+# Tool instance containing all function declarations; the declaration
+# set is fixed at import, so it is passed as a tuple to make the
+# immutability explicit
 travel_tool = types.Tool(
-    function_declarations=[
+    function_declarations=(
         take_a_nap_declaration,
         NameCorrectionAgent_declaration,
         SpecialClaimAgent_declaration,
@@ -53,7 +63,7 @@ travel_tool = types.Tool(
         Booking_Cancellation_Agent_declaration,
         Flight_Booking_Details_Agent_declaration,
         Webcheckin_And_Boarding_Pass_Agent_declaration,
-    ]
+    )
 )
 
 # Function mapping for easy lookup of implementations
@@ -72,15 +82,123 @@ available_functions = {
 }
 
 
+# Registry trace prints are developer diagnostics; they're off unless
+# explicitly enabled so the production dispatch path skips timestamp
+# formatting and string interpolation entirely.
+_DEBUG = os.environ.get("REGISTRY_DEBUG") == "1"
+
+# Shared ANSI escapes for the trace prints; one string object each
+# instead of a fresh literal embedded in every f-string.
+_C_GREEN = "\033[92m"
+_C_YELLOW = "\033[93m"
+_C_CYAN = "\033[96m"
+_C_RED = "\033[91m"
+_C_RESET = "\033[0m"
+
+
+def _dbg(line: str) -> None:
+    """Write a trace line straight to the real stdout.
+
+    The trace lines are ANSI-decorated and never JSON; routing them
+    through the capture tee would pay a JSON sniff, a timestamp format
+    and a dict append per line for entries nobody queries.
+    """
+    log_capture.raw_stdout.write(line + "\n")
+
+
+def _fmt_ts(t: float) -> str:
+    """Format a time.time() sample as HH:MM:SS.mmm via integer math."""
+    # strftime has no %f directive (the old format printed a literal
+    # "%f") and costs far more than three divmods
+    millis = int(t * 1000)
+    secs, ms = divmod(millis, 1000)
+    mins, sec = divmod(secs, 60)
+    hrs, minute = divmod(mins, 60)
+    return f"{hrs % 24:02d}:{minute:02d}:{sec:02d}.{ms:03d}"
+
+
+# Concurrent function executions allowed per registry; excess calls wait
+# on the semaphore instead of piling up as runnable tasks.
+_MAX_CONCURRENT_EXECUTIONS = settings.MAX_CONCURRENT_TOOLCALLS
+
+# Cap on a single awaited execution so one stalled tool cannot pin a
+# semaphore slot for the life of the session. The synchronous launchers
+# return in microseconds; this mainly guards future coroutine or
+# blocking tools against hung upstream calls.
+_TOOL_TIMEOUT = settings.TOOL_TIMEOUT_SECONDS
+
+# Names of registered tools that do genuinely blocking synchronous work
+# (DB queries, HTTP requests, ...). These are routed through a shared
+# thread pool so a slow tool cannot stall the event loop and delay every
+# websocket send. The current synchronous wrappers are non-blocking
+# launchers - they create_task their real work and must therefore run on
+# the loop thread - so the set ships empty; add a tool's name when
+# registering one that actually blocks.
+BLOCKING_TOOL_NAMES: frozenset = frozenset()
+
+# Shared executor for blocking tools, created on first use so the demo
+# configuration (no blocking tools) never spawns the threads.
+_blocking_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+# Function-kind markers resolved once per registry; iscoroutinefunction
+# walks functools.wraps chains, so classifying on every dispatch was
+# repeated work on the hot path.
+_KIND_COROUTINE = 0
+_KIND_BLOCKING = 1
+_KIND_SYNC = 2
+
+
+def _get_blocking_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Get the shared thread pool for blocking tools, creating it once."""
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=settings.MAX_CONCURRENT_TOOLCALLS,
+            thread_name_prefix="tool",
+        )
+    return _blocking_executor
+
+
+def shutdown_blocking_executor() -> None:
+    """Tear down the blocking-tool thread pool at process exit."""
+    global _blocking_executor
+    if _blocking_executor is not None:
+        _blocking_executor.shutdown(wait=False, cancel_futures=True)
+        _blocking_executor = None
+
+
 class CallbackBasedFunctionRegistry:
     """Enhanced function registry with callback-based execution for non-blocking function calls."""
     
     def __init__(self, session, functions_dict: Dict[str, Callable] = None, tool_results_queue: asyncio.Queue = None):
         """Initialize the callback-based function registry."""
         self.session = session
-        self.functions = functions_dict or available_functions
+        # Interned keys make the per-dispatch lookup hit the pointer
+        # identity fast path once the incoming name is interned too
+        self.functions = {
+            sys.intern(name): func
+            for name, func in (functions_dict or available_functions).items()
+        }
         self.running_tasks: Dict[str, asyncio.Task] = {}
+        # Classify each function up front so dispatch is one dict lookup
+        self._kind: Dict[str, int] = {
+            name: (_KIND_COROUTINE if asyncio.iscoroutinefunction(func)
+                   else _KIND_BLOCKING if name in BLOCKING_TOOL_NAMES
+                   else _KIND_SYNC)
+            for name, func in self.functions.items()
+        }
         self.tool_results_queue = tool_results_queue
+        self._sem = asyncio.Semaphore(_MAX_CONCURRENT_EXECUTIONS)
+        # Completion tasks are tracked only until done: the discard
+        # callback keeps the set from growing for the session lifetime
+        # while still holding a strong reference so the loop can't drop
+        # a running task
+        self._inflight: set = set()
+        # Locally generated call IDs only need uniqueness within the
+        # session; a random prefix plus a counter avoids the
+        # os.urandom syscall uuid4 paid per call
+        self._id_prefix = secrets.token_hex(4)
+        self._id_counter = itertools.count()
         
     async def execute_function_async(
         self,
@@ -89,28 +207,49 @@ class CallbackBasedFunctionRegistry:
         call_id: str
     ) -> Dict[str, Any]:
         """Execute a function asynchronously and return the result."""
+        function_name = sys.intern(function_name)
         try:
-            if function_name not in self.functions:
+            # One hash probe instead of a membership test plus a lookup
+            func = self.functions.get(function_name)
+            if func is None:
                 raise ValueError(f"Function '{function_name}' not found in registry")
-
-            func = self.functions[function_name]
             
-            exec_timestamp = time.strftime("%H:%M:%S.%f")[:-3]
-            print(f"\033[92m[{exec_timestamp}] 🛠️ REGISTRY_EXEC_START: Executing {function_name} with args: {arguments}\033[0m")
+            if _DEBUG:
+                exec_timestamp = _fmt_ts(time.time())
+                _dbg(f"{_C_GREEN}[{exec_timestamp}] 🛠️ REGISTRY_EXEC_START: Executing {function_name} with args: {arguments}{_C_RESET}")
 
-            # Execute the function
+            # Execute the function; the semaphore caps concurrent
+            # executions so a burst of tool calls can't flood the loop
             start_time = time.time()
-            if asyncio.iscoroutinefunction(func):
-                result = await func(**arguments)
-            else:
-                # All our tools now take session and queue as the first arguments
-                result = func(self.session, self.tool_results_queue, **arguments)
+            kind = self._kind[function_name]
+            async with self._sem:
+                if kind == _KIND_COROUTINE:
+                    result = await asyncio.wait_for(func(**arguments), _TOOL_TIMEOUT)
+                elif kind == _KIND_BLOCKING:
+                    # Blocking sync work runs off the loop on the shared
+                    # thread pool. wait_for stops awaiting on timeout;
+                    # the pool thread itself cannot be interrupted and
+                    # is left to drain on its own
+                    loop = asyncio.get_running_loop()
+                    result = await asyncio.wait_for(
+                        loop.run_in_executor(
+                            _get_blocking_executor(),
+                            functools.partial(func, self.session, self.tool_results_queue, **arguments),
+                        ),
+                        _TOOL_TIMEOUT,
+                    )
+                else:
+                    # All our tools now take session and queue as the first
+                    # arguments; these wrappers create_task their real work,
+                    # so they must stay on the loop thread
+                    result = func(self.session, self.tool_results_queue, **arguments)
             
             end_time = time.time()
             duration = (end_time - start_time) * 1000
             
-            result_timestamp = time.strftime("%H:%M:%S.%f")[:-3]
-            print(f"\033[92m[{result_timestamp}] 🎉 REGISTRY_EXEC_COMPLETE: {function_name} completed in {duration:.2f}ms\033[0m")
+            if _DEBUG:
+                result_timestamp = _fmt_ts(time.time())
+                _dbg(f"{_C_GREEN}[{result_timestamp}] 🎉 REGISTRY_EXEC_COMPLETE: {function_name} completed in {duration:.2f}ms{_C_RESET}")
 
             return {
                 'result': result,
@@ -119,9 +258,20 @@ class CallbackBasedFunctionRegistry:
                 'call_id': call_id
             }
 
+        except asyncio.TimeoutError:
+            if _DEBUG:
+                error_timestamp = _fmt_ts(time.time())
+                _dbg(f"{_C_RED}[{error_timestamp}] ❌ REGISTRY_EXEC_TIMEOUT: {function_name} exceeded {_TOOL_TIMEOUT}s and was cancelled{_C_RESET}")
+            return {
+                'error': f"Function '{function_name}' timed out after {_TOOL_TIMEOUT}s",
+                'status': 'error',
+                'function_name': function_name,
+                'call_id': call_id
+            }
         except Exception as e:
-            error_timestamp = time.strftime("%H:%M:%S.%f")[:-3]
-            print(f"\033[91m[{error_timestamp}] ❌ REGISTRY_EXEC_ERROR: Error executing {function_name}: {e}\033[0m")
+            if _DEBUG:
+                error_timestamp = _fmt_ts(time.time())
+                _dbg(f"{_C_RED}[{error_timestamp}] ❌ REGISTRY_EXEC_ERROR: Error executing {function_name}: {e}{_C_RESET}")
             return {
                 'error': str(e),
                 'status': 'error',
@@ -140,8 +290,9 @@ class CallbackBasedFunctionRegistry:
         call_id: str
     ) -> asyncio.Task:
         """Start function execution in background and return the task."""
-        task_start_timestamp = time.strftime("%H:%M:%S.%f")[:-3]
-        print(f"\033[93m[{task_start_timestamp}] 🚀 REGISTRY_TASK_START: Starting background task for {function_name}\033[0m")
+        if _DEBUG:
+            task_start_timestamp = _fmt_ts(time.time())
+            _dbg(f"{_C_YELLOW}[{task_start_timestamp}] 🚀 REGISTRY_TASK_START: Starting background task for {function_name}{_C_RESET}")
         
         task = asyncio.create_task(
             self.execute_function_async(function_name, arguments, call_id)
@@ -150,14 +301,21 @@ class CallbackBasedFunctionRegistry:
 
         return task
     
-    async def _on_function_completed(self, task: asyncio.Task, call_id: str, function_name: str) -> None:
-        """Handle completion of a function call with callback pattern."""
+    async def _run_and_complete(self, function_name: str, arguments: Dict[str, Any], call_id: str) -> None:
+        """Execute a function and deliver its result as one task."""
+        # One task covers execution and completion; the old shape
+        # (execution task + done_callback spawning a second completion
+        # task) allocated an extra Task and an extra loop iteration per
+        # tool call for no added concurrency
+        result = await self.execute_function_async(function_name, arguments, call_id)
+        await self._deliver_result(result, call_id, function_name)
+
+    async def _deliver_result(self, result, call_id: str, function_name: str) -> None:
+        """Send or queue the function response for a completed call."""
         try:
-            # Get the function result
-            result = await task
-            
-            completion_timestamp = time.strftime("%H:%M:%S.%f")[:-3]
-            print(f"\033[93m[{completion_timestamp}] ✅ REGISTRY_CALLBACK_COMPLETE: Function {function_name} completed via callback\033[0m")
+            if _DEBUG:
+                completion_timestamp = _fmt_ts(time.time())
+                _dbg(f"{_C_YELLOW}[{completion_timestamp}] ✅ REGISTRY_CALLBACK_COMPLETE: Function {function_name} completed via callback{_C_RESET}")
             
             # Extract the actual result message
             if isinstance(result, dict) and 'result' in result:
@@ -190,19 +348,22 @@ class CallbackBasedFunctionRegistry:
             if self.tool_results_queue:
                 await self.tool_results_queue.put(function_response)
                 
-                response_timestamp = time.strftime("%H:%M:%S.%f")[:-3]
-                print(f"\033[93m[{response_timestamp}] 📤 REGISTRY_RESPONSE_QUEUED: Function response queued for {function_name} - will be sent when turn completes\033[0m")
+                if _DEBUG:
+                    response_timestamp = _fmt_ts(time.time())
+                    _dbg(f"{_C_YELLOW}[{response_timestamp}] 📤 REGISTRY_RESPONSE_QUEUED: Function response queued for {function_name} - will be sent when turn completes{_C_RESET}")
             else:
                 # Fallback to immediate sending if no queue available
                 if self.session:
                     await self.session.send_tool_response(function_responses=[function_response])
                     
-                    response_timestamp = time.strftime("%H:%M:%S.%f")[:-3]
-                    print(f"\033[93m[{response_timestamp}] 📤 REGISTRY_RESPONSE_SENT: Function response sent immediately for {function_name} (no queue)\033[0m")
+                    if _DEBUG:
+                        response_timestamp = _fmt_ts(time.time())
+                        _dbg(f"{_C_YELLOW}[{response_timestamp}] 📤 REGISTRY_RESPONSE_SENT: Function response sent immediately for {function_name} (no queue){_C_RESET}")
                 
         except Exception as e:
-            error_timestamp = time.strftime("%H:%M:%S.%f")[:-3]
-            print(f"\033[91m[{error_timestamp}] ❌ REGISTRY_CALLBACK_ERROR: Error in callback for {function_name}: {e}\033[0m")
+            if _DEBUG:
+                error_timestamp = _fmt_ts(time.time())
+                _dbg(f"{_C_RED}[{error_timestamp}] ❌ REGISTRY_CALLBACK_ERROR: Error in callback for {function_name}: {e}{_C_RESET}")
 
     def start_function_with_callback(
         self,
@@ -212,25 +373,27 @@ class CallbackBasedFunctionRegistry:
     ) -> str:
         """Start function execution with callback-based completion."""
         if call_id is None:
-            call_id = str(uuid.uuid4())
-            
-        # Start function execution in background
-        task = self.start_function_execution(function_name, arguments, call_id)
-        
-        # Set up task completion callback
-        task.add_done_callback(
-            lambda t, cid=call_id, fname=function_name: 
-            asyncio.create_task(self._on_function_completed(t, cid, fname))
+            call_id = f"{self._id_prefix}-{next(self._id_counter)}"
+
+        # Single tracked task runs execution and completion end to end
+        task = asyncio.create_task(
+            self._run_and_complete(function_name, arguments, call_id)
         )
-        
-        callback_timestamp = time.strftime("%H:%M:%S.%f")[:-3]
-        print(f"\033[96m[{callback_timestamp}] 🔄 REGISTRY_CALLBACK_SET: Callback set for {function_name} (ID: {call_id})\033[0m")
+        self.running_tasks[call_id] = task
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+        if _DEBUG:
+            callback_timestamp = _fmt_ts(time.time())
+            _dbg(f"{_C_CYAN}[{callback_timestamp}] 🔄 REGISTRY_CALLBACK_SET: Callback set for {function_name} (ID: {call_id}){_C_RESET}")
         
         return call_id
 
     def get_running_tasks(self) -> Dict[str, asyncio.Task]:
-        """Get all currently running function tasks."""
-        return self.running_tasks.copy()
+        """Get a read-only live view of the running function tasks."""
+        # Zero-copy: monitoring polls shouldn't allocate a dict per
+        # call. Callers needing a point-in-time copy can dict() it.
+        return MappingProxyType(self.running_tasks)
 
     def is_function_available(self, name: str) -> bool:
         """Check if a function is available in the registry."""
@@ -2,90 +2,227 @@
 Audio processing utilities and buffer management.
 """
 
-import asyncio
+import json
+import struct
+import time
 from typing import Dict, Any, List
 from datetime import datetime, timezone
 
 from app.core.config import settings
 
 
+# Binary WebSocket frame format for audio delivery to the client.
+# A frame is the magic byte 0x01 followed by one or more records:
+#
+#     [u32 little-endian metadata length][metadata JSON][PCM payload]
+#
+# The PCM payload length of each record is the "size_bytes" field of its
+# metadata JSON. The metadata carries the fields previously sent as a
+# separate "audio_metadata" JSON message, plus the playback-start signal
+# folded in as a "first_in_run" flag, so one websocket.send() replaces the
+# former send_json + send_json + send sequence per chunk. The frontend
+# parser in useCommunication.js unpacks the records before queueing audio.
+AUDIO_FRAME_MAGIC = b"\x01"
+_pack_u32 = struct.Struct("<I").pack
+
+# Milliseconds of output audio per PCM16 byte; precomputed so the hot
+# paths multiply instead of dividing per chunk (2 bytes per sample).
+_OUT_MS_PER_BYTE = 1000.0 / (2 * settings.OUTPUT_SAMPLE_RATE)
+
+# Cap for batched flush frames; records ring over into a new frame when a
+# batch would exceed this size, to avoid saturating the TCP send buffer
+# with a single oversized message.
+MAX_BATCH_FRAME_BYTES = 256 * 1024
+
+# Small LIFO pool of bytearrays reused for frame assembly, so a steady
+# 24 kHz output stream doesn't allocate a fresh buffer per chunk.
+# Oversized buffers are dropped on release instead of pinning memory.
+_BUF_POOL: List[bytearray] = []
+_BUF_POOL_MAX = 8
+_BUF_MAX_BYTES = 128 * 1024
+
+
+def acquire_frame_buffer() -> bytearray:
+    """Get an empty bytearray for frame assembly, reusing a pooled one."""
+    if _BUF_POOL:
+        return _BUF_POOL.pop()
+    return bytearray()
+
+
+def release_frame_buffer(buf: bytearray) -> None:
+    """Return a frame buffer to the pool for reuse."""
+    if len(buf) <= _BUF_MAX_BYTES and len(_BUF_POOL) < _BUF_POOL_MAX:
+        buf.clear()
+        _BUF_POOL.append(buf)
+
+
+def pack_audio_frame(metadata: Dict[str, Any], audio_data: bytes) -> bytes:
+    """Pack metadata and PCM audio into a single binary WebSocket frame."""
+    return pack_audio_frame_raw(json.dumps(metadata).encode("utf-8"), audio_data)
+
+
+def pack_audio_frame_raw(meta_bytes: bytes, audio_data: bytes) -> bytes:
+    """Pack pre-serialized metadata JSON and PCM audio into a binary frame."""
+    buf = acquire_frame_buffer()
+    buf += AUDIO_FRAME_MAGIC
+    buf += _pack_u32(len(meta_bytes))
+    buf += meta_bytes
+    buf += audio_data
+    frame = bytes(buf)
+    release_frame_buffer(buf)
+    return frame
+
+
+def pack_audio_frame_records(records: List[tuple]) -> bytes:
+    """
+    Pack pre-serialized (meta_bytes, audio_data) records into one frame.
+
+    Unlike pack_audio_frame_batch this never splits: callers cap the
+    batch size themselves while draining their queue.
+    """
+    buf = acquire_frame_buffer()
+    buf += AUDIO_FRAME_MAGIC
+    for meta_bytes, audio_data in records:
+        buf += _pack_u32(len(meta_bytes))
+        buf += meta_bytes
+        buf += audio_data
+    frame = bytes(buf)
+    release_frame_buffer(buf)
+    return frame
+
+
+def pack_audio_frame_batch(chunks: List[tuple]) -> List[bytes]:
+    """
+    Pack (metadata, audio_data) pairs into as few binary frames as possible.
+
+    Args:
+        chunks: List of (metadata dict, PCM bytes) tuples
+
+    Returns:
+        List of binary frames, each at most MAX_BATCH_FRAME_BYTES
+    """
+    frames: List[bytes] = []
+    batch = acquire_frame_buffer()
+    batch += AUDIO_FRAME_MAGIC
+
+    for metadata, audio_data in chunks:
+        meta_bytes = json.dumps(metadata).encode("utf-8")
+        record_len = 4 + len(meta_bytes) + len(audio_data)
+        if len(batch) > 1 and len(batch) + record_len > MAX_BATCH_FRAME_BYTES:
+            frames.append(bytes(batch))
+            batch.clear()
+            batch += AUDIO_FRAME_MAGIC
+        batch += _pack_u32(len(meta_bytes))
+        batch += meta_bytes
+        batch += audio_data
+
+    if len(batch) > 1:
+        frames.append(bytes(batch))
+    release_frame_buffer(batch)
+    return frames
+
+
 class AudioBuffer:
-    """Manages audio buffering with overflow protection."""
-    
+    """
+    Fixed-capacity ring buffer for audio chunks with overwrite-oldest
+    overflow protection.
+
+    The audio and metadata slots are preallocated once, so the single
+    producer writes into existing list positions instead of growing a
+    list, and overflow is two index updates rather than the O(n) element
+    shift of list.pop(0).
+    """
+
+    __slots__ = ("max_size", "_audio", "_meta", "_head", "_count",
+                 "_sequence_counter", "_high_thresh", "_med_thresh")
+
+    # Prototype copied per chunk, same pattern as AudioMetadata: one
+    # C-level dict copy plus four item stores instead of rebuilding the
+    # literal (and a second merged dict for the ** splat) per chunk
+    _CHUNK_META_TEMPLATE = {
+        "sequence": 0,
+        "size_bytes": 0,
+        "expected_duration_ms": 0.0,
+        "sample_rate": settings.OUTPUT_SAMPLE_RATE,
+        "timestamp": 0.0,
+        "buffered": True,
+    }
+
     def __init__(self, max_size: int = None):
         self.max_size = max_size or settings.MAX_BUFFER_SIZE
-        self.buffer: List[Dict[str, Any]] = []
+        self._audio: List[bytes] = [b""] * self.max_size
+        self._meta: List[Dict[str, Any]] = [None] * self.max_size
+        self._head = 0
+        self._count = 0
         self._sequence_counter = 0
-    
-    def add_audio_chunk(self, audio_data: bytes, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+        # Pressure thresholds as integers so polling compares counts
+        # instead of dividing into a fill ratio per call
+        self._high_thresh = (self.max_size * 9) // 10
+        self._med_thresh = (self.max_size * 8) // 10
+
+    def add_audio_chunk(self, audio_data: bytes, metadata: Dict[str, Any] = None):
         """
-        Add audio chunk to buffer with metadata.
-        
+        Add audio chunk to the ring, overwriting the oldest when full.
+
         Args:
             audio_data: Raw audio bytes
             metadata: Optional additional metadata
-            
+
         Returns:
-            Dict containing the audio chunk data and metadata
+            Tuple of (metadata stored for this chunk, number of chunks
+            overwritten to make room)
         """
         self._sequence_counter += 1
-        current_time = asyncio.get_event_loop().time()
-        
         chunk_size = len(audio_data)
-        samples_per_chunk = chunk_size // 2  # PCM16 = 2 bytes per sample
-        expected_duration_ms = (samples_per_chunk / settings.OUTPUT_SAMPLE_RATE) * 1000
-        
-        audio_chunk_data = {
-            "type": "buffered_audio",
-            "audio_data": audio_data,
-            "metadata": {
-                "sequence": self._sequence_counter,
-                "size_bytes": chunk_size,
-                "expected_duration_ms": round(expected_duration_ms, 2),
-                "sample_rate": settings.OUTPUT_SAMPLE_RATE,
-                "timestamp": current_time,
-                "buffered": True,
-                **(metadata or {})
-            }
-        }
-        
-        self.buffer.append(audio_chunk_data)
-        
-        # Handle buffer overflow
-        if len(self.buffer) > self.max_size:
-            removed_chunks = self._remove_overflow_chunks()
-            return audio_chunk_data, removed_chunks
-        
-        return audio_chunk_data, []
-    
-    def _remove_overflow_chunks(self) -> List[Dict[str, Any]]:
-        """Remove oldest chunks when buffer overflows."""
-        removed_chunks = []
-        while len(self.buffer) > self.max_size:
-            removed_chunk = self.buffer.pop(0)
-            removed_chunks.append(removed_chunk)
-        return removed_chunks
-    
-    def flush_all(self) -> List[Dict[str, Any]]:
-        """Flush all buffered chunks and return them."""
-        chunks = list(self.buffer)
-        self.buffer.clear()
-        return chunks
-    
+
+        chunk_meta = self._CHUNK_META_TEMPLATE.copy()
+        chunk_meta["sequence"] = self._sequence_counter
+        chunk_meta["size_bytes"] = chunk_size
+        chunk_meta["expected_duration_ms"] = round(chunk_size * _OUT_MS_PER_BYTE, 2)
+        chunk_meta["timestamp"] = time.monotonic()
+        if metadata:
+            chunk_meta.update(metadata)
+
+        removed_count = 0
+        if self._count == self.max_size:
+            # Full: reclaim the oldest slot and advance the head
+            slot = self._head
+            self._head = (self._head + 1) % self.max_size
+            removed_count = 1
+        else:
+            slot = (self._head + self._count) % self.max_size
+            self._count += 1
+        self._audio[slot] = audio_data
+        self._meta[slot] = chunk_meta
+        return chunk_meta, removed_count
+
+    def flush_all(self) -> List[tuple]:
+        """Drain the ring and return (metadata, audio_data) pairs in order."""
+        pairs = []
+        head, count, capacity = self._head, self._count, self.max_size
+        for i in range(count):
+            slot = (head + i) % capacity
+            pairs.append((self._meta[slot], self._audio[slot]))
+            self._audio[slot] = b""
+            self._meta[slot] = None
+        self._head = 0
+        self._count = 0
+        return pairs
+
     def is_empty(self) -> bool:
         """Check if buffer is empty."""
-        return len(self.buffer) == 0
-    
+        return self._count == 0
+
     def size(self) -> int:
         """Get current buffer size."""
-        return len(self.buffer)
-    
+        return self._count
+
     def get_pressure_level(self) -> str:
         """Get buffer pressure level."""
-        fill_ratio = len(self.buffer) / self.max_size
-        if fill_ratio > 0.9:
+        count = self._count
+        if count > self._high_thresh:
             return "high"
-        elif fill_ratio > 0.8:
+        elif count > self._med_thresh:
             return "medium"
         else:
             return "low"
@@ -93,35 +230,48 @@ class AudioBuffer:
 
 class AudioMetadata:
     """Utilities for audio metadata generation."""
-    
+
+    # Prototype copied per chunk instead of rebuilding the constant keys;
+    # the duration ratio is precomputed for the default output rate so the
+    # common path multiplies instead of dividing (PCM16 = 2 bytes/sample)
+    _METADATA_TEMPLATE = {
+        "type": "audio_metadata",
+        "sequence": 0,
+        "size_bytes": 0,
+        "expected_duration_ms": 0.0,
+        "sample_rate": settings.OUTPUT_SAMPLE_RATE,
+        "timestamp": 0.0,
+    }
+    _DEFAULT_MS_PER_BYTE = _OUT_MS_PER_BYTE
+
     @staticmethod
-    def create_metadata(sequence: int, chunk_size: int, 
+    def create_metadata(sequence: int, chunk_size: int,
                        sample_rate: int = None, **kwargs) -> Dict[str, Any]:
         """
         Create audio metadata for a chunk.
-        
+
         Args:
             sequence: Sequence number
             chunk_size: Size of audio chunk in bytes
             sample_rate: Sample rate (defaults to OUTPUT_SAMPLE_RATE)
             **kwargs: Additional metadata fields
-            
+
         Returns:
             Dictionary containing metadata
         """
-        sample_rate = sample_rate or settings.OUTPUT_SAMPLE_RATE
-        samples_per_chunk = chunk_size // 2  # PCM16
-        expected_duration_ms = (samples_per_chunk / sample_rate) * 1000
-        
-        return {
-            "type": "audio_metadata",
-            "sequence": sequence,
-            "size_bytes": chunk_size,
-            "expected_duration_ms": round(expected_duration_ms, 2),
-            "sample_rate": sample_rate,
-            "timestamp": asyncio.get_event_loop().time(),
-            **kwargs
-        }
+        metadata = AudioMetadata._METADATA_TEMPLATE.copy()
+        metadata["sequence"] = sequence
+        metadata["size_bytes"] = chunk_size
+        if sample_rate is None:
+            ms_per_byte = AudioMetadata._DEFAULT_MS_PER_BYTE
+        else:
+            metadata["sample_rate"] = sample_rate
+            ms_per_byte = 1000.0 / (2 * sample_rate)
+        metadata["expected_duration_ms"] = round(chunk_size * ms_per_byte, 2)
+        metadata["timestamp"] = time.monotonic()
+        if kwargs:
+            metadata.update(kwargs)
+        return metadata
     
     @staticmethod
     def create_buffer_pressure_warning(buffer_size: int, max_size: int, 
@@ -4,9 +4,19 @@ Logging utilities and setup.
 
 import sys
 import io
-import json
+import collections
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List
+
+from app.core.config import settings
+from app.utils.serialization import JSONDecodeError, json_loads
+
+# Pre-bound at import: write() runs per stdout line, and resolving
+# datetime.now / timezone.utc through two attribute lookups each time
+# adds measurable overhead at that frequency. Entries keep the ISO
+# string form because /api/logs consumers read the field directly.
+_now = datetime.now
+_UTC = timezone.utc
 
 
 class StdoutTee(io.TextIOBase):
@@ -14,9 +24,9 @@ class StdoutTee(io.TextIOBase):
     Custom stdout handler that captures logs and forwards to original stdout.
     """
     
-    def __init__(self, original_stdout, log_list: List[Dict[str, Any]]):
+    def __init__(self, original_stdout, store_entry: Callable[[Dict[str, Any]], None]):
         self._original_stdout = original_stdout
-        self._log_list = log_list
+        self._store = store_entry
 
     def write(self, s: str) -> int:
         """Write to both original stdout and capture logs."""
@@ -24,24 +34,29 @@ class StdoutTee(io.TextIOBase):
         s_stripped = s.strip()
         
         if s_stripped:
-            try:
-                # Attempt to parse as JSON for structured logs
-                log_entry = json.loads(s_stripped)
-                
+            # Only lines shaped like a JSON object get the parser; most
+            # stdout traffic is plain debug text, and raising a decode
+            # error per line costs far more than this check. The parse
+            # itself runs in orjson's C code when available
+            if s_stripped[:1] == "{" and s_stripped[-1:] == "}":
+                try:
+                    log_entry = json_loads(s_stripped)
+                except JSONDecodeError:
+                    log_entry = None
                 if isinstance(log_entry, dict) and log_entry.get("log_type") == "TOOL_EVENT":
-                    self._log_list.append(log_entry)
+                    self._store(log_entry)
                 else:
                     # Store as raw log with context
-                    self._log_list.append({
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                    self._store({
+                        "timestamp": _now(_UTC).isoformat(),
                         "log_type": "RAW_STDOUT",
                         "message": s_stripped,
                         "parsed_json": log_entry if isinstance(log_entry, dict) else None
                     })
-            except json.JSONDecodeError:
+            else:
                 # Store raw string entry
-                self._log_list.append({
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                self._store({
+                    "timestamp": _now(_UTC).isoformat(),
                     "log_type": "RAW_STDOUT",
                     "message": s_stripped
                 })
@@ -59,14 +74,31 @@ class LogCapture:
     """
     
     def __init__(self):
-        self.captured_logs: List[Dict[str, Any]] = []
+        # Bounded ring: a 24/7 server would otherwise accumulate every
+        # stdout line forever. appended_total keeps counting across
+        # evictions so pollers can tell a trimmed tail from an
+        # unchanged one.
+        self.captured_logs: collections.deque = collections.deque(
+            maxlen=settings.MAX_CAPTURED_LOGS
+        )
+        self.appended_total = 0
         self._original_stdout = sys.stdout
         self._tee = None
-        
+
+    @property
+    def raw_stdout(self):
+        """The real stdout, bypassing the capture tee."""
+        return self._original_stdout
+
+    def add_entry(self, entry: Dict[str, Any]):
+        """Append a captured entry, evicting the oldest past the cap."""
+        self.captured_logs.append(entry)
+        self.appended_total += 1
+
     def start_capture(self):
         """Start capturing stdout logs."""
         if self._tee is None:
-            self._tee = StdoutTee(self._original_stdout, self.captured_logs)
+            self._tee = StdoutTee(self._original_stdout, self.add_entry)
             sys.stdout = self._tee
     
     def stop_capture(self):
@@ -0,0 +1,45 @@
+"""
+Lightweight queue primitives for intra-connection plumbing.
+"""
+
+import asyncio
+import collections
+
+
+class ToolResultsQueue:
+    """
+    Thin deque wrapper used for tool-result delivery.
+
+    The consumer drains on triggers (turn completion, speech gap) rather
+    than blocking on get, so asyncio.Queue's Future-based wakeup and
+    task_done/join accounting were pure per-item overhead here. put is
+    kept awaitable for drop-in compatibility with the existing producers.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self):
+        self._items = collections.deque()
+
+    async def put(self, item) -> None:
+        """Append an item; never blocks (the queue is unbounded)."""
+        self._items.append(item)
+
+    def put_nowait(self, item) -> None:
+        """Append an item without the coroutine wrapper."""
+        self._items.append(item)
+
+    def get_nowait(self):
+        """Pop the oldest item, raising asyncio.QueueEmpty when drained."""
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise asyncio.QueueEmpty from None
+
+    def empty(self) -> bool:
+        """Check whether the queue has no pending items."""
+        return not self._items
+
+    def qsize(self) -> int:
+        """Get the number of pending items."""
+        return len(self._items)
@@ -0,0 +1,55 @@
+"""
+JSON serialization helpers for the streaming and API hot paths.
+
+orjson serializes the small dict payloads used here several times
+faster than the stdlib encoder and handles datetime natively; the
+stdlib fallback keeps the app importable when the optional dependency
+is missing.
+"""
+
+from datetime import date, datetime
+
+try:
+    import orjson
+
+    def json_dumps_bytes(obj) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes."""
+        return orjson.dumps(obj)
+
+    def json_loads(s):
+        """Parse a JSON document from str or bytes."""
+        return orjson.loads(s)
+
+    JSONDecodeError = orjson.JSONDecodeError
+
+except ImportError:  # pragma: no cover - exercised only without orjson
+    import json
+
+    def _json_default(obj):
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def json_dumps_bytes(obj) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes."""
+        return json.dumps(obj, default=_json_default).encode("utf-8")
+
+    def json_loads(s):
+        """Parse a JSON document from str or bytes."""
+        return json.loads(s)
+
+    JSONDecodeError = json.JSONDecodeError
+
+
+def json_response_body(obj) -> bytes:
+    """Serialize obj for an application/json response body."""
+    return json_dumps_bytes(obj)
+
+
+async def send_json_fast(ws, obj) -> None:
+    """Send obj as a JSON text frame on the given websocket.
+
+    The frame must stay textual: the client routes binary frames to the
+    audio parser, so the serialized bytes are decoded before sending.
+    """
+    await ws.send(json_dumps_bytes(obj).decode("utf-8"))
@@ -538,6 +538,124 @@ export const useCommunication = (
         setIsWebSocketConnected(false);
         setWebSocketStatus("Error");
       };
+      // Apply one transcription/model update message to turn tracking and
+      // the message list. Updates may arrive individually or batched in a
+      // single "transcription_batch" frame. Streaming messages carry an
+      // incremental "delta" appended to the utterance text by id; final
+      // messages carry the full "text".
+      const handleTranscriptionUpdate = (receivedData) => {
+        const isDelta = receivedData.delta !== undefined;
+        addLogEntryRef.current(
+          receivedData.type,
+          `${receivedData.sender}: ${isDelta ? receivedData.delta : receivedData.text} (Final: ${receivedData.is_final})`
+        );
+        
+        // Enhanced turn tracking with better audio management
+        const tracking = chunkTrackingRef.current;
+        
+        // Detect new turns and turn completion
+        if (receivedData.id && receivedData.id !== tracking.currentTurnId) {
+          // New turn started - but don't immediately close previous turn
+          if (tracking.currentTurnId) {
+            // For async tool calls, we need to allow previous conversation to continue
+            // Only mark as ended if there are no pending chunks to play
+            const pendingChunksForPreviousTurn = jitterBufferRef.current.length;
+            
+            if (tracking.turnChunkData[tracking.currentTurnId]) {
+              const prevTurnData = tracking.turnChunkData[tracking.currentTurnId];
+              
+              if (pendingChunksForPreviousTurn === 0 && !isPlayingRef.current) {
+                // No pending audio, safe to close previous turn
+                prevTurnData.endSignalReceived = true;
+                tracking.turnEndSignals.add(tracking.currentTurnId);
+                checkForTruncationIssues(tracking.currentTurnId);
+                
+                addLogEntryRef.current(
+                  "turn_transition",
+                  `✅ Clean turn transition: Previous turn ${tracking.currentTurnId} completed, starting new turn ${receivedData.id}`
+                );
+              } else {
+                // Audio still playing from previous turn - defer the transition
+                addLogEntryRef.current(
+                  "turn_transition",
+                  `🔄 DEFERRED TURN TRANSITION: Previous turn ${tracking.currentTurnId} still has ${pendingChunksForPreviousTurn} chunks queued + ${isPlayingRef.current ? 'audio playing' : 'no active playback'}. New turn ${receivedData.id} will start after completion.`
+                );
+                
+                // Mark that we have a pending turn transition
+                tracking.pendingTurnId = receivedData.id;
+                tracking.pendingTurnStartTime = Date.now();
+                
+                // Don't change currentTurnId yet - let current turn finish
+                // Note: Continue processing instead of returning to handle subsequent updates
+              }
+            }
+          }
+          
+          // Initialize new turn (only if we're not deferring)
+          const previousTurnId = tracking.currentTurnId;
+          tracking.currentTurnId = receivedData.id;
+          tracking.chunksReceivedCurrentTurn = 0;
+          tracking.chunksPlayedCurrentTurn = 0;
+          
+          if (!tracking.turnChunkData[receivedData.id]) {
+            tracking.turnChunkData[receivedData.id] = {
+              received: 0,
+              played: 0,
+              startTime: Date.now(),
+              endSignalReceived: false
+            };
+          }
+          
+          // Simplified turn logging
+        }
+        
+        // Handle turn completion
+        if (receivedData.is_final) {
+          tracking.isExpectingMoreChunks = false;
+          if (tracking.turnChunkData[receivedData.id]) {
+            tracking.turnChunkData[receivedData.id].endSignalReceived = true;
+            tracking.turnEndSignals.add(receivedData.id);
+          }
+          
+          // Turn completed - trigger playback
+          
+          // Trigger early playback if we have pending chunks
+          if (jitterBufferRef.current.length > 0 && !isPlayingRef.current) {
+            addLogEntryRef.current("turn_final_playback", "▶️ Starting final chunk playback");
+            playAudioFromQueue();
+          }
+        } else {
+          tracking.isExpectingMoreChunks = true;
+        }
+        
+        setTranscriptionMessages((prevMessages) => {
+          const existingMessageIndex = prevMessages.findIndex(
+            (msg) => msg.id === receivedData.id
+          );
+          if (existingMessageIndex !== -1) {
+            return prevMessages.map((msg) =>
+              msg.id === receivedData.id
+                ? {
+                    ...msg,
+                    text: isDelta ? msg.text + receivedData.delta : receivedData.text,
+                    is_final: receivedData.is_final,
+                  }
+                : msg
+            );
+          } else {
+            return [
+              ...prevMessages,
+              {
+                id: receivedData.id,
+                text: isDelta ? receivedData.delta : receivedData.text,
+                sender: receivedData.sender,
+                is_final: receivedData.is_final,
+              },
+            ];
+          }
+        });
+      };
+
       socketRef.current.onmessage = (event) => {
         if (typeof event.data === "string") {
           try {
@@ -556,116 +674,16 @@ export const useCommunication = (
                         sendAudioChunkWithBackpressure(chunk);
                     });
                 }
-            } else if (receivedData.type && receivedData.type.endsWith("_update")) {
-              addLogEntryRef.current(
-                receivedData.type,
-                `${receivedData.sender}: ${receivedData.text} (Final: ${receivedData.is_final})`
-              );
-              
-              // Enhanced turn tracking with better audio management
-              const tracking = chunkTrackingRef.current;
-              
-              // Detect new turns and turn completion
-              if (receivedData.id && receivedData.id !== tracking.currentTurnId) {
-                // New turn started - but don't immediately close previous turn
-                if (tracking.currentTurnId) {
-                  // For async tool calls, we need to allow previous conversation to continue
-                  // Only mark as ended if there are no pending chunks to play
-                  const pendingChunksForPreviousTurn = jitterBufferRef.current.length;
-                  
-                  if (tracking.turnChunkData[tracking.currentTurnId]) {
-                    const prevTurnData = tracking.turnChunkData[tracking.currentTurnId];
-                    
-                    if (pendingChunksForPreviousTurn === 0 && !isPlayingRef.current) {
-                      // No pending audio, safe to close previous turn
-                      prevTurnData.endSignalReceived = true;
-                      tracking.turnEndSignals.add(tracking.currentTurnId);
-                      checkForTruncationIssues(tracking.currentTurnId);
-                      
-                      addLogEntryRef.current(
-                        "turn_transition",
-                        `✅ Clean turn transition: Previous turn ${tracking.currentTurnId} completed, starting new turn ${receivedData.id}`
-                      );
-                    } else {
-                      // Audio still playing from previous turn - defer the transition
-                      addLogEntryRef.current(
-                        "turn_transition",
-                        `🔄 DEFERRED TURN TRANSITION: Previous turn ${tracking.currentTurnId} still has ${pendingChunksForPreviousTurn} chunks queued + ${isPlayingRef.current ? 'audio playing' : 'no active playback'}. New turn ${receivedData.id} will start after completion.`
-                      );
-                      
-                      // Mark that we have a pending turn transition
-                      tracking.pendingTurnId = receivedData.id;
-                      tracking.pendingTurnStartTime = Date.now();
-                      
-                      // Don't change currentTurnId yet - let current turn finish
-                      // Note: Continue processing instead of returning to handle subsequent updates
-                    }
-                  }
-                }
-                
-                // Initialize new turn (only if we're not deferring)
-                const previousTurnId = tracking.currentTurnId;
-                tracking.currentTurnId = receivedData.id;
-                tracking.chunksReceivedCurrentTurn = 0;
-                tracking.chunksPlayedCurrentTurn = 0;
-                
-                if (!tracking.turnChunkData[receivedData.id]) {
-                  tracking.turnChunkData[receivedData.id] = {
-                    received: 0,
-                    played: 0,
-                    startTime: Date.now(),
-                    endSignalReceived: false
-                  };
-                }
-                
-                // Simplified turn logging
+            } else if (receivedData.type === "transcription_batch") {
+              for (const update of receivedData.updates) {
+                handleTranscriptionUpdate(update);
               }
-              
-              // Handle turn completion
-              if (receivedData.is_final) {
-                tracking.isExpectingMoreChunks = false;
-                if (tracking.turnChunkData[receivedData.id]) {
-                  tracking.turnChunkData[receivedData.id].endSignalReceived = true;
-                  tracking.turnEndSignals.add(receivedData.id);
-                }
-                
-                // Turn completed - trigger playback
-                
-                // Trigger early playback if we have pending chunks
-                if (jitterBufferRef.current.length > 0 && !isPlayingRef.current) {
-                  addLogEntryRef.current("turn_final_playback", "▶️ Starting final chunk playback");
-                  playAudioFromQueue();
-                }
-              } else {
-                tracking.isExpectingMoreChunks = true;
-              }
-              
-              setTranscriptionMessages((prevMessages) => {
-                const existingMessageIndex = prevMessages.findIndex(
-                  (msg) => msg.id === receivedData.id
-                );
-                if (existingMessageIndex !== -1) {
-                  return prevMessages.map((msg) =>
-                    msg.id === receivedData.id
-                      ? {
-                          ...msg,
-                          text: receivedData.text,
-                          is_final: receivedData.is_final,
-                        }
-                      : msg
-                  );
-                } else {
-                  return [
-                    ...prevMessages,
-                    {
-                      id: receivedData.id,
-                      text: receivedData.text,
-                      sender: receivedData.sender,
-                      is_final: receivedData.is_final,
-                    },
-                  ];
-                }
-              });
+            } else if (
+              receivedData.type &&
+              (receivedData.type.endsWith("_update") ||
+                receivedData.type.endsWith("_delta"))
+            ) {
+              handleTranscriptionUpdate(receivedData);
             } else if (receivedData.type === "error") {
               addLogEntryRef.current(
                 "error",
@@ -781,121 +799,179 @@ export const useCommunication = (
             );
           }
         } else if (event.data instanceof ArrayBuffer) {
-          addLogEntryRef.current(
-            "diag_audio_chunk_received",
-            `[DIAG] Audio chunk received. Queue size: ${jitterBufferRef.current.length}, Pending queue size: ${chunkTrackingRef.current.pendingGenerationQueue.length}`
-          );
-          // Enhanced audio chunk tracking
-          const tracking = chunkTrackingRef.current;
-          tracking.totalChunksReceived++;
-          tracking.lastChunkReceivedTime = Date.now();
-          
-          // DETAILED STATE LOGGING
-          const currentTime = new Date().toTimeString().split(' ')[0];
-          addLogEntryRef.current(
-            "audio_chunk_debug",
-            `[${currentTime}] 🔍 CHUNK RECEIVED #${tracking.totalChunksReceived}: isPlaying=${isPlayingRef.current}, queueLength=${jitterBufferRef.current.length}, pendingQueue=${tracking.pendingGenerationQueue.length}`
-          );
-          
-          // Handle audio chunks - could be for current turn or pending turn
-          let targetTurnId = tracking.currentTurnId;
-          
-          // If we have a pending turn and no current audio playing, chunks might be for the pending turn
-          if (tracking.pendingTurnId && jitterBufferRef.current.length === 0 && !isPlayingRef.current) {
-            addLogEntryRef.current(
-              "audio_chunk_routing",
-              `📦 Audio chunk received during pending turn transition - routing to pending turn ${tracking.pendingTurnId}`
-            );
-            targetTurnId = tracking.pendingTurnId;
+          // Backend packs metadata + PCM into binary frames: 0x01 magic,
+          // then one or more [u32le metadata length][metadata JSON][PCM]
+          // records (batched flushes carry many records per frame; each
+          // record's PCM length is its metadata's size_bytes field). The
+          // metadata carries the former "audio_metadata" fields plus the
+          // playback-start signal as a "first_in_run" flag.
+          const audioRecords = [];
+          const frameView = new DataView(event.data);
+          if (frameView.byteLength >= 5 && frameView.getUint8(0) === 0x01) {
+            try {
+              const textDecoder = new TextDecoder();
+              let offset = 1;
+              while (offset + 4 <= frameView.byteLength) {
+                const metaLength = frameView.getUint32(offset, true);
+                const metadata = JSON.parse(
+                  textDecoder.decode(
+                    new Uint8Array(event.data, offset + 4, metaLength)
+                  )
+                );
+                const pcmStart = offset + 4 + metaLength;
+                const pcmLength = metadata.size_bytes;
+                audioRecords.push(event.data.slice(pcmStart, pcmStart + pcmLength));
+                offset = pcmStart + pcmLength;
+
+                addLogEntryRef.current(
+                  "audio_receive",
+                  `Audio metadata: ${metadata.size_bytes} bytes, ${metadata.expected_duration_ms}ms duration, seq=${metadata.sequence}`
+                );
+                pendingMetadataRef.current.set(metadata.sequence, metadata);
+                if (pendingMetadataRef.current.size > 100) {
+                  const entries = Array.from(pendingMetadataRef.current.entries());
+                  entries.sort((a, b) => a[0] - b[0]);
+                  const toDelete = entries.slice(0, entries.length - 100);
+                  toDelete.forEach(([seq]) => pendingMetadataRef.current.delete(seq));
+                }
+
+                if (metadata.first_in_run) {
+                  addLogEntryRef.current(
+                    "gemini_playback_correlation",
+                    `Gemini playback STARTED: seq=${metadata.sequence}, vad_should_activate=${metadata.vad_should_activate} [ID: ${metadata.correlation_id}]`
+                  );
+                }
+              }
+            } catch (e) {
+              addLogEntryRef.current(
+                "error",
+                `Failed to parse binary audio frame: ${e.message}`
+              );
+            }
           } else {
-            // Chunks for current turn
-            tracking.chunksReceivedCurrentTurn++;
+            // Legacy raw PCM frame without a metadata header
+            audioRecords.push(event.data);
           }
-          
-          // Update turn data for the appropriate turn
-          if (targetTurnId && tracking.turnChunkData[targetTurnId]) {
-            tracking.turnChunkData[targetTurnId].received++;
-            
+
+          const processAudioChunk = (audioData) => {
             addLogEntryRef.current(
-              "audio_chunk_received",
-              `📦 Audio chunk received for turn ${targetTurnId}: ${tracking.turnChunkData[targetTurnId].received} total (queue: ${jitterBufferRef.current.length} chunks)`
+              "diag_audio_chunk_received",
+              `[DIAG] Audio chunk received. Queue size: ${jitterBufferRef.current.length}, Pending queue size: ${chunkTrackingRef.current.pendingGenerationQueue.length}`
             );
-          } else if (targetTurnId) {
-            // Initialize turn data if it doesn't exist
-            tracking.turnChunkData[targetTurnId] = {
-              received: 1,
-              played: 0,
-              startTime: Date.now(),
-              endSignalReceived: false
-            };
-            
+            // Enhanced audio chunk tracking
+            const tracking = chunkTrackingRef.current;
+            tracking.totalChunksReceived++;
+            tracking.lastChunkReceivedTime = Date.now();
+          
+            // DETAILED STATE LOGGING
+            const currentTime = new Date().toTimeString().split(' ')[0];
             addLogEntryRef.current(
-              "audio_chunk_received",
-              `📦 First audio chunk for new turn ${targetTurnId} (queue: ${jitterBufferRef.current.length} chunks)`
+              "audio_chunk_debug",
+              `[${currentTime}] 🔍 CHUNK RECEIVED #${tracking.totalChunksReceived}: isPlaying=${isPlayingRef.current}, queueLength=${jitterBufferRef.current.length}, pendingQueue=${tracking.pendingGenerationQueue.length}`
             );
-          }
           
-          // IMPROVED GENERATION SEPARATION LOGIC WITH TURN CONTEXT
-          const currentlyPlaying = isPlayingRef.current;
-          const hasQueuedAudio = jitterBufferRef.current.length > 0;
-          const hasActiveTurn = tracking.currentTurnId && tracking.isExpectingMoreChunks;
-          const hasPendingTurn = tracking.pendingTurnId;
+            // Handle audio chunks - could be for current turn or pending turn
+            let targetTurnId = tracking.currentTurnId;
           
-          addLogEntryRef.current(
-            "audio_generation_check",
-            `[${currentTime}] 🎯 GENERATION CHECK: currentlyPlaying=${currentlyPlaying}, hasQueuedAudio=${hasQueuedAudio}, hasActiveTurn=${hasActiveTurn}, hasPendingTurn=${hasPendingTurn}, currentTurn=${tracking.currentTurnId}`
-          );
+            // If we have a pending turn and no current audio playing, chunks might be for the pending turn
+            if (tracking.pendingTurnId && jitterBufferRef.current.length === 0 && !isPlayingRef.current) {
+              addLogEntryRef.current(
+                "audio_chunk_routing",
+                `📦 Audio chunk received during pending turn transition - routing to pending turn ${tracking.pendingTurnId}`
+              );
+              targetTurnId = tracking.pendingTurnId;
+            } else {
+              // Chunks for current turn
+              tracking.chunksReceivedCurrentTurn++;
+            }
           
-          // Only treat as new generation if:
-          // 1. Audio is playing AND queue is empty AND
-          // 2. We don't have an active turn expecting more chunks AND  
-          // 3. We don't have a pending turn transition
-          // This prevents tool responses from being misclassified as new generations
-          const shouldQueueAsNewGeneration = currentlyPlaying && 
-                                           !hasQueuedAudio && 
-                                           !hasActiveTurn && 
-                                           !hasPendingTurn;
+            // Update turn data for the appropriate turn
+            if (targetTurnId && tracking.turnChunkData[targetTurnId]) {
+              tracking.turnChunkData[targetTurnId].received++;
+            
+              addLogEntryRef.current(
+                "audio_chunk_received",
+                `📦 Audio chunk received for turn ${targetTurnId}: ${tracking.turnChunkData[targetTurnId].received} total (queue: ${jitterBufferRef.current.length} chunks)`
+              );
+            } else if (targetTurnId) {
+              // Initialize turn data if it doesn't exist
+              tracking.turnChunkData[targetTurnId] = {
+                received: 1,
+                played: 0,
+                startTime: Date.now(),
+                endSignalReceived: false
+              };
+            
+              addLogEntryRef.current(
+                "audio_chunk_received",
+                `📦 First audio chunk for new turn ${targetTurnId} (queue: ${jitterBufferRef.current.length} chunks)`
+              );
+            }
           
-          addLogEntryRef.current(
-            "diag_queueing_decision",
-            `[DIAG] shouldQueueAsNewGeneration: ${shouldQueueAsNewGeneration}. State: { currentlyPlaying: ${currentlyPlaying}, hasQueuedAudio: ${hasQueuedAudio}, hasActiveTurn: ${hasActiveTurn}, hasPendingTurn: ${hasPendingTurn} }`
-          );
+            // IMPROVED GENERATION SEPARATION LOGIC WITH TURN CONTEXT
+            const currentlyPlaying = isPlayingRef.current;
+            const hasQueuedAudio = jitterBufferRef.current.length > 0;
+            const hasActiveTurn = tracking.currentTurnId && tracking.isExpectingMoreChunks;
+            const hasPendingTurn = tracking.pendingTurnId;
           
-          if (shouldQueueAsNewGeneration) {
-            tracking.pendingGenerationQueue.push(event.data);
-            addLogEntryRef.current(
-              "audio_generation_detected",
-              `[${currentTime}] 🚧 NEW GENERATION DETECTED: Audio playing with empty queue and no active turn - queuing chunk for later (queue size: ${tracking.pendingGenerationQueue.length})`
-            );
-            return;
-          } else if (currentlyPlaying && !hasQueuedAudio && (hasActiveTurn || hasPendingTurn)) {
-            // This is likely a tool response or continuation of current conversation
             addLogEntryRef.current(
-              "audio_continuation_detected",
-              `[${currentTime}] 🔄 TURN CONTINUATION: Audio playing but expecting more chunks for turn ${targetTurnId} - adding to main buffer`
+              "audio_generation_check",
+              `[${currentTime}] 🎯 GENERATION CHECK: currentlyPlaying=${currentlyPlaying}, hasQueuedAudio=${hasQueuedAudio}, hasActiveTurn=${hasActiveTurn}, hasPendingTurn=${hasPendingTurn}, currentTurn=${tracking.currentTurnId}`
             );
-          }
           
-          // Normal processing - add to main jitter buffer
-          jitterBufferRef.current.push(event.data);
-          addLogEntryRef.current(
-            "audio_normal_processing",
-            `[${currentTime}] ✅ NORMAL PROCESSING: Added chunk to main buffer (new queue size: ${jitterBufferRef.current.length})`
-          );
+            // Only treat as new generation if:
+            // 1. Audio is playing AND queue is empty AND
+            // 2. We don't have an active turn expecting more chunks AND  
+            // 3. We don't have a pending turn transition
+            // This prevents tool responses from being misclassified as new generations
+            const shouldQueueAsNewGeneration = currentlyPlaying && 
+                                             !hasQueuedAudio && 
+                                             !hasActiveTurn && 
+                                             !hasPendingTurn;
           
-          // Try to start playback if not already playing
-          if (!isPlayingRef.current) {
             addLogEntryRef.current(
-              "audio_playback_trigger",
-              `[${currentTime}] 🎬 TRIGGERING PLAYBACK: Starting playAudioFromQueue with ${jitterBufferRef.current.length} chunks`
+              "diag_queueing_decision",
+              `[DIAG] shouldQueueAsNewGeneration: ${shouldQueueAsNewGeneration}. State: { currentlyPlaying: ${currentlyPlaying}, hasQueuedAudio: ${hasQueuedAudio}, hasActiveTurn: ${hasActiveTurn}, hasPendingTurn: ${hasPendingTurn} }`
             );
-            playAudioFromQueue();
-          } else {
+          
+            if (shouldQueueAsNewGeneration) {
+              tracking.pendingGenerationQueue.push(audioData);
+              addLogEntryRef.current(
+                "audio_generation_detected",
+                `[${currentTime}] 🚧 NEW GENERATION DETECTED: Audio playing with empty queue and no active turn - queuing chunk for later (queue size: ${tracking.pendingGenerationQueue.length})`
+              );
+              return;
+            } else if (currentlyPlaying && !hasQueuedAudio && (hasActiveTurn || hasPendingTurn)) {
+              // This is likely a tool response or continuation of current conversation
+              addLogEntryRef.current(
+                "audio_continuation_detected",
+                `[${currentTime}] 🔄 TURN CONTINUATION: Audio playing but expecting more chunks for turn ${targetTurnId} - adding to main buffer`
+              );
+            }
+          
+            // Normal processing - add to main jitter buffer
+            jitterBufferRef.current.push(audioData);
             addLogEntryRef.current(
-              "audio_playback_skip",
-              `[${currentTime}] ⏭️ SKIPPING PLAYBACK: Already playing, chunk added to queue (size: ${jitterBufferRef.current.length})`
+              "audio_normal_processing",
+              `[${currentTime}] ✅ NORMAL PROCESSING: Added chunk to main buffer (new queue size: ${jitterBufferRef.current.length})`
             );
-          }
+          
+            // Try to start playback if not already playing
+            if (!isPlayingRef.current) {
+              addLogEntryRef.current(
+                "audio_playback_trigger",
+                `[${currentTime}] 🎬 TRIGGERING PLAYBACK: Starting playAudioFromQueue with ${jitterBufferRef.current.length} chunks`
+              );
+              playAudioFromQueue();
+            } else {
+              addLogEntryRef.current(
+                "audio_playback_skip",
+                `[${currentTime}] ⏭️ SKIPPING PLAYBACK: Already playing, chunk added to queue (size: ${jitterBufferRef.current.length})`
+              );
+            }
+          };
+
+          audioRecords.forEach(processAudioChunk);
         }
       };
     },